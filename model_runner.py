@@ -6,12 +6,13 @@ from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain.schema import Document
 from openai import OpenAI
 import sys
-import hashlib
 import json
 import random
 from datetime import datetime
 import uuid
 
+from talk_dnd_to_me.utils.file_utils import get_file_hash, get_text_key
+
 # Suppress tokenizers parallelism warning
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
@@ -31,19 +32,6 @@ embedding_model = None
 current_session_id = None
 
 
-def get_file_hash(file_path):
-    """Calculate SHA256 hash of a file"""
-    hash_sha256 = hashlib.sha256()
-    try:
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()
-    except Exception as e:
-        print(f"Error hashing file {file_path}: {e}")
-        return None
-
-
 def check_file_cache(file_path):
     """Check if file is cached and unchanged"""
     try:
@@ -53,10 +41,10 @@ def check_file_cache(file_path):
 
         # Check if cache collection has any documents first
         try:
-            cache_id = f"cache_{hashlib.md5(file_path.encode()).hexdigest()}"
+            cache_id = f"cache_{get_text_key(file_path)}"
             results = cache_collection.get(ids=[cache_id])
 
-            if results["documents"] and len(results["documents"]) > 0:
+            if results["ids"]:
                 cached_data = json.loads(results["documents"][0])
                 return cached_data.get("file_hash") == current_hash
             return False
@@ -92,7 +80,7 @@ def update_file_cache(file_path, file_hash, chunk_ids, metadata):
             metadatas=[
                 {"file_path": file_path, "last_modified": cache_data["last_modified"]}
             ],
-            ids=[f"cache_{hashlib.md5(file_path.encode()).hexdigest()}"],
+            ids=[f"cache_{get_text_key(file_path)}"],
         )
         print(f"✓ Updated cache for {os.path.basename(file_path)}")
     except Exception as e:
@@ -203,35 +191,19 @@ def setup_collections():
         chroma_client = chromadb.Client()
 
         # Create or get collections
-        try:
-            content_collection = chroma_client.get_collection("curse_of_strahd_content")
-            print("✓ Using existing content collection")
-        except Exception:
-            content_collection = chroma_client.create_collection(
-                "curse_of_strahd_content"
-            )
-            print("✓ Created content collection")
+        content_collection = chroma_client.get_or_create_collection(
+            "curse_of_strahd_content"
+        )
+        print("✓ Ready: content collection")
 
-        try:
-            history_collection = chroma_client.get_collection("campaign_history")
-            print("✓ Using existing history collection")
-        except Exception:
-            history_collection = chroma_client.create_collection("campaign_history")
-            print("✓ Created history collection")
+        history_collection = chroma_client.get_or_create_collection("campaign_history")
+        print("✓ Ready: history collection")
 
-        try:
-            character_collection = chroma_client.get_collection("character_data")
-            print("✓ Using existing character collection")
-        except Exception:
-            character_collection = chroma_client.create_collection("character_data")
-            print("✓ Created character collection")
+        character_collection = chroma_client.get_or_create_collection("character_data")
+        print("✓ Ready: character collection")
 
-        try:
-            cache_collection = chroma_client.get_collection("file_cache")
-            print("✓ Using existing cache collection")
-        except Exception:
-            cache_collection = chroma_client.create_collection("file_cache")
-            print("✓ Created cache collection")
+        cache_collection = chroma_client.get_or_create_collection("file_cache")
+        print("✓ Ready: cache collection")
 
     except Exception as e:
         print(f"✗ Error setting up ChromaDB: {e}")
@@ -261,7 +233,7 @@ def process_documents(documents, files_to_process):
         chunk_ids = []
 
         for i, chunk in enumerate(chunks):
-            chunk_id = f"chunk_{hashlib.md5((file_path + str(i)).encode()).hexdigest()}"
+            chunk_id = f"chunk_{get_text_key(file_path + str(i))}"
             chunk.metadata["chunk_id"] = chunk_id
             chunk_ids.append(chunk_id)
             all_chunks.append(chunk)
@@ -391,12 +363,10 @@ def update_character(character_name, update_type, update_data):
         character_id = f"char_{character_name.lower().replace(' ', '_')}"
 
         # Try to get existing character
-        results = character_collection.query(
-            query_embeddings=None, where={"character_id": character_id}, n_results=1
-        )
+        results = character_collection.get(ids=[character_id])
 
-        if results["documents"] and len(results["documents"][0]) > 0:
-            character_data = json.loads(results["documents"][0][0])
+        if results["ids"]:
+            character_data = json.loads(results["documents"][0])
         else:
             # Create new character
             character_data = {
@@ -490,12 +460,10 @@ def get_character_info(character_name):
     try:
         character_id = f"char_{character_name.lower().replace(' ', '_')}"
 
-        results = character_collection.query(
-            query_embeddings=None, where={"character_id": character_id}, n_results=1
-        )
+        results = character_collection.get(ids=[character_id])
 
-        if results["documents"] and len(results["documents"][0]) > 0:
-            character_data = json.loads(results["documents"][0][0])
+        if results["ids"]:
+            character_data = json.loads(results["documents"][0])
 
             # Format character info for display
             info = f"📋 **{character_data['name']}**\n"
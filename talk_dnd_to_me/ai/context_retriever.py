@@ -4,6 +4,8 @@
 import json
 from typing import List, Optional, Dict, Any
 
+import numpy as np
+
 from ..database.chroma_client import ChromaClient
 from ..content.embeddings import EmbeddingManager
 from ..config.settings import ContentConfig
@@ -59,37 +61,46 @@ class ContextRetriever:
             # Adjust retrieval strategy based on session recall intent
             is_session_recall = query_intent.get("session_recall", False)
 
+            # Embed the query once and share it across all three tiers
+            query_embedding = self.embedding_manager.embed_query(query)
+
             if is_session_recall:
                 # For session recall queries, prioritize session history heavily
                 tier1_context = self._get_current_session_context(
-                    query, current_session_id, max_results=2
+                    query, query_embedding, current_session_id, max_results=2
                 )
                 remaining_slots = max_chunks - len(tier1_context)
 
                 # Give most slots to session history
                 tier2_context = self._get_session_history_context(
-                    query, query_intent, max_results=min(6, remaining_slots)
+                    query,
+                    query_embedding,
+                    query_intent,
+                    max_results=min(6, remaining_slots),
                 )
                 remaining_slots = max_chunks - len(tier1_context) - len(tier2_context)
 
                 # Minimal campaign content for session recall queries
                 tier3_context = self._get_campaign_context(
-                    query, max_results=min(2, remaining_slots)
+                    query, query_embedding, max_results=min(2, remaining_slots)
                 )
             else:
                 # Normal three-tier retrieval
                 tier1_context = self._get_current_session_context(
-                    query, current_session_id, max_results=2
+                    query, query_embedding, current_session_id, max_results=2
                 )
                 remaining_slots = max_chunks - len(tier1_context)
 
                 tier2_context = self._get_session_history_context(
-                    query, query_intent, max_results=min(4, remaining_slots)
+                    query,
+                    query_embedding,
+                    query_intent,
+                    max_results=min(4, remaining_slots),
                 )
                 remaining_slots = max_chunks - len(tier1_context) - len(tier2_context)
 
                 tier3_context = self._get_campaign_context(
-                    query, max_results=remaining_slots
+                    query, query_embedding, max_results=remaining_slots
                 )
 
             # Combine all context with priority ordering
@@ -144,12 +155,17 @@ class ContextRetriever:
             return False
 
     def _get_current_session_context(
-        self, query: str, current_session_id: Optional[str], max_results: int
+        self,
+        query: str,
+        query_embedding: np.ndarray,
+        current_session_id: Optional[str],
+        max_results: int,
     ) -> List[Dict[str, Any]]:
         """Get context from current session (Tier 1 - Highest Priority).
 
         Args:
             query: User query
+            query_embedding: Embedding of the query
             current_session_id: Current session ID
             max_results: Maximum results to return
 
@@ -160,8 +176,6 @@ class ContextRetriever:
             return []
 
         try:
-            query_embedding = self.embedding_manager.embed_query(query)
-
             # Query current session data from current_session collection
             results = self.chroma_client.query_collection(
                 "current_session",
@@ -200,12 +214,17 @@ class ContextRetriever:
             return []
 
     def _get_session_history_context(
-        self, query: str, query_intent: Dict[str, int], max_results: int
+        self,
+        query: str,
+        query_embedding: np.ndarray,
+        query_intent: Dict[str, int],
+        max_results: int,
     ) -> List[Dict[str, Any]]:
         """Get context from session history summaries (Tier 2 - High Priority).
 
         Args:
             query: User query
+            query_embedding: Embedding of the query
             query_intent: Query intent analysis
             max_results: Maximum results to return
 
@@ -213,8 +232,6 @@ class ContextRetriever:
             List of context items
         """
         try:
-            query_embedding = self.embedding_manager.embed_query(query)
-
             # Query session history collection
             results = self.chroma_client.query_collection(
                 "session_history",
@@ -391,12 +408,13 @@ class ContextRetriever:
         }
 
     def _get_campaign_context(
-        self, query: str, max_results: int
+        self, query: str, query_embedding: np.ndarray, max_results: int
     ) -> List[Dict[str, Any]]:
         """Get context from campaign content (Tier 3 - Normal Priority).
 
         Args:
             query: User query
+            query_embedding: Embedding of the query
             max_results: Maximum results to return
 
         Returns:
@@ -409,8 +427,6 @@ class ContextRetriever:
             current_act = world_context.get("current_act", "Act I")
             current_arc = world_context.get("current_arc", "")
 
-            query_embedding = self.embedding_manager.embed_query(query)
-
             # Enhanced query intent analysis
             query_intent = self._enhanced_analyze_query_intent(query)
 
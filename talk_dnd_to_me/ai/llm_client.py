@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """LLM client wrapper for OpenAI-compatible APIs."""
 
-from typing import List, Dict, Any, Optional, Generator, Tuple
+from typing import List, Dict, Any, Optional, Generator, Sequence, Tuple
 from openai import OpenAI
 
 from ..config.settings import AIConfig
@@ -38,14 +38,14 @@ class LLMClient:
     def chat_completion(
         self,
         messages: List[Dict[str, Any]],
-        tools: Optional[List[Dict[str, Any]]] = None,
+        tools: Optional[Sequence[Dict[str, Any]]] = None,
         tool_choice: str = "auto",
     ) -> Any:
         """Generate chat completion.
 
         Args:
             messages: List of conversation messages
-            tools: Optional list of tool definitions
+            tools: Optional sequence of tool definitions
             tool_choice: Tool choice strategy
 
         Returns:
@@ -70,14 +70,14 @@ class LLMClient:
     def chat_completion_stream(
         self,
         messages: List[Dict[str, Any]],
-        tools: Optional[List[Dict[str, Any]]] = None,
+        tools: Optional[Sequence[Dict[str, Any]]] = None,
         tool_choice: str = "auto",
     ) -> Generator[str, None, Tuple[str, Any]]:
         """Generate streaming chat completion.
 
         Args:
             messages: List of conversation messages
-            tools: Optional list of tool definitions
+            tools: Optional sequence of tool definitions
             tool_choice: Tool choice strategy
 
         Yields:
@@ -192,7 +192,7 @@ class LLMClient:
     def chat_completion_with_streaming(
         self,
         messages: List[Dict[str, Any]],
-        tools: Optional[List[Dict[str, Any]]] = None,
+        tools: Optional[Sequence[Dict[str, Any]]] = None,
         tool_choice: str = "auto",
         use_streaming: Optional[bool] = None,
         force_streaming: bool = False,
@@ -201,7 +201,7 @@ class LLMClient:
 
         Args:
             messages: List of conversation messages
-            tools: Optional list of tool definitions
+            tools: Optional sequence of tool definitions
             tool_choice: Tool choice strategy
             use_streaming: Whether to use streaming (uses config default if None)
             force_streaming: Force streaming even when tools are present
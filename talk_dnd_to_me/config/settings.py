@@ -17,6 +17,7 @@ class DatabaseConfig:
     current_session_collection: str = "current_session"  # Live session data
     character_collection: str = "character_data"  # Player characters, progression
     world_state_collection: str = "world_state"  # Current story position, flags
+    world_state_delta_collection: str = "world_state_deltas"  # World state changes
     cache_collection: str = "file_cache"  # File processing cache
 
 
@@ -10,7 +10,11 @@ from ..config.settings import ContentConfig
 from ..database.chroma_client import ChromaClient
 from ..database.cache_manager import CacheManager
 from ..content.embeddings import EmbeddingManager
-from ..utils.file_utils import find_markdown_files, get_file_hash, get_md5_hash
+from ..utils.file_utils import (
+    find_markdown_files,
+    get_text_key,
+    hash_files_batched,
+)
 
 
 class ContentLoader:
@@ -60,14 +64,23 @@ class ContentLoader:
         files_to_process = []
         cached_chunks = []
 
-        # Check which files need processing
+        # Check which files need processing, fetching all cache entries at once
+        cached_hashes = self.cache_manager.check_file_cache_bulk(md_files)
+        current_hashes = hash_files_batched(md_files)
+        cached_files = []
         for file_path in md_files:
-            if self.cache_manager.check_file_cache(file_path):
+            current_hash = current_hashes.get(file_path)
+            if current_hash and cached_hashes.get(file_path) == current_hash:
                 print(f"✓ Using cached version of {os.path.basename(file_path)}")
-                cached_chunks.extend(self.cache_manager.get_cached_chunks(file_path))
+                cached_files.append(file_path)
             else:
                 files_to_process.append(file_path)
 
+        for chunk_ids in self.cache_manager.get_cached_chunks_bulk(
+            cached_files
+        ).values():
+            cached_chunks.extend(chunk_ids)
+
         print(
             f"Processing {len(files_to_process)} new/changed files, using {len(cached_chunks)} cached chunks"
         )
@@ -158,7 +171,7 @@ class ContentLoader:
             chunk_ids = []
 
             for i, chunk in enumerate(chunks):
-                chunk_id = f"chunk_{get_md5_hash(file_path + str(i))}"
+                chunk_id = f"chunk_{get_text_key(file_path + str(i))}"
                 chunk.metadata["chunk_id"] = chunk_id
                 chunk_ids.append(chunk_id)
                 all_chunks.append(chunk)
@@ -215,23 +228,27 @@ class ContentLoader:
                 try:
                     self.chroma_client.delete_from_collection(
                         "campaign_reference", where={"source": file_path}
+                    ).result()
+                except Exception as e:
+                    print(
+                        f"⚠ Warning: Could not remove old chunks for {file_path}: {e}"
                     )
-                except Exception:
-                    pass
 
-            # Add new chunks
+            # Add new chunks, waiting for the write so the file cache is only
+            # updated once the chunks are actually stored
             self.chroma_client.add_documents(
                 "campaign_reference",
                 documents=chunk_texts,
                 metadatas=metadatas,
                 ids=chunk_ids,
                 embeddings=embeddings,
-            )
+            ).result()
             print(f"✓ Stored {len(all_chunks)} chunks in database")
 
             # Update file cache
+            file_hashes = hash_files_batched(files_to_process)
             for file_path in files_to_process:
-                file_hash = get_file_hash(file_path)
+                file_hash = file_hashes.get(file_path)
                 if file_hash and file_path in file_chunk_mapping:
                     # Find the document metadata for this file
                     doc_metadata = next(
@@ -249,6 +266,8 @@ class ContentLoader:
                         doc_metadata,
                     )
 
+            self.cache_manager.drain()
+
         except Exception as e:
             print(f"✗ Error storing in ChromaDB: {e}")
 
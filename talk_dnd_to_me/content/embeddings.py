@@ -3,6 +3,8 @@
 
 import os
 from typing import List, Optional
+
+import numpy as np
 from langchain_huggingface import HuggingFaceEmbeddings
 
 from ..config.settings import AIConfig
@@ -56,16 +58,16 @@ class EmbeddingManager:
 
         return self.embedding_model.embed_documents(texts)
 
-    def embed_query(self, text: str) -> List[float]:
+    def embed_query(self, text: str) -> np.ndarray:
         """Generate embedding for a single query.
 
         Args:
             text: Query text
 
         Returns:
-            Embedding vector
+            Embedding vector as a float32 array, which ChromaDB accepts as is
         """
         if not self.embedding_model:
             raise RuntimeError("Embedding model not initialized")
 
-        return self.embedding_model.embed_query(text)
+        return np.asarray(self.embedding_model.embed_query(text), dtype=np.float32)
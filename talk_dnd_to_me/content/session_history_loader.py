@@ -98,10 +98,14 @@ class SessionHistoryLoader:
         Returns:
             List of session file paths
         """
-        session_files = []
-        for filename in os.listdir(self.sessions_dir):
-            if filename.startswith("session_") and filename.endswith(".md"):
-                session_files.append(os.path.join(self.sessions_dir, filename))
+        with os.scandir(self.sessions_dir) as entries:
+            session_files = [
+                entry.path
+                for entry in entries
+                if entry.name.startswith("session_")
+                and entry.name.endswith(".md")
+                and entry.is_file()
+            ]
 
         # Sort by session number
         session_files.sort(key=lambda x: self._extract_session_number(x))
@@ -182,14 +186,15 @@ class SessionHistoryLoader:
         metadatas = [chunk["metadata"] for chunk in chunks]
         ids = [chunk["id"] for chunk in chunks]
 
-        # Add to session_history collection
+        # Add to session_history collection, waiting so that a failed write
+        # is reported by the caller instead of as a processed file
         self.chroma_client.add_documents(
             "session_history",
             documents=documents,
             metadatas=metadatas,
             ids=ids,
             embeddings=embeddings,
-        )
+        ).result()
 
     def _extract_session_metadata(self, file_path: str, content: str) -> Dict[str, Any]:
         """Extract metadata from session file.
@@ -245,6 +245,15 @@ class DMEngine:
             else "I'm having trouble generating a response right now."
         )
 
+    def reset_conversation(self):
+        """Clear per-conversation state so the engine can be reused.
+
+        Pending character updates are saved and the current session is
+        forgotten, so the next generate_response call starts a new one.
+        """
+        self.character_manager.flush()
+        self.session_manager.current_session_id = None
+
     def reset_campaign_progress(self) -> bool:
         """Reset all campaign progress while keeping content.
 
@@ -493,6 +502,7 @@ Player Character: {player_summary}"""
                 if user_input.lower() in ["quit", "exit", "q", "end session"]:
                     print("\n🌙 Ending session...")
                     end_result = self.session_manager.end_session(self.llm_client)
+                    self.character_manager.flush()
                     print(end_result)
                     print("The mists of Barovia fade as you step back into reality...")
                     print(
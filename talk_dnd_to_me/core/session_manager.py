@@ -4,8 +4,11 @@
 import json
 import uuid
 import os
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+import orjson
 
 from ..database.chroma_client import ChromaClient
 
@@ -56,34 +59,62 @@ class SessionManager:
         Args:
             entry_data: Entry data to log
         """
-        if not self.current_session_id:
-            return
+        self.log_batch([entry_data])
 
-        try:
-            entry = {
-                "session_id": self.current_session_id,
-                "timestamp": datetime.now().isoformat(),
-                "entry_id": str(uuid.uuid4()),
-                **entry_data,
-            }
+    def log_batch(self, entries: List[Dict[str, Any]]):
+        """Log several entries to the current session history in one write.
 
-            entry_id = f"entry_{entry['entry_id']}"
+        Args:
+            entries: Entry data to log, in order
+        """
+        if not self.current_session_id or not entries:
+            return
 
-            self.chroma_client.add_documents(
-                "current_session",
-                documents=[json.dumps(entry)],
-                metadatas=[
+        try:
+            documents = []
+            metadatas = []
+            ids = []
+            timestamp = datetime.now().isoformat()
+
+            for entry_data in entries:
+                entry = {
+                    "session_id": self.current_session_id,
+                    "timestamp": timestamp,
+                    "entry_id": str(uuid.uuid4()),
+                    **entry_data,
+                }
+                documents.append(orjson.dumps(entry).decode())
+                metadatas.append(
                     {
                         "session_id": self.current_session_id,
                         "entry_type": entry.get("entry_type", "unknown"),
                         "timestamp": entry["timestamp"],
                     }
-                ],
-                ids=[entry_id],
+                )
+                ids.append(f"entry_{entry['entry_id']}")
+
+            future = self.chroma_client.add_documents(
+                "current_session", documents=documents, metadatas=metadatas, ids=ids
             )
 
         except Exception as e:
             print(f"Warning: Error logging to session: {e}")
+            return
+
+        # The entries are written in the background; report a failed write
+        # once it has been applied
+        future.add_done_callback(self._report_log_error)
+
+    @staticmethod
+    def _report_log_error(future: Future):
+        """Print the error of a failed session log write.
+
+        Args:
+            future: Completed write from ChromaClient.add_documents
+        """
+        error = future.exception()
+        if error:
+            print(f"Warning: Error logging to session: {error}")
 
     def end_session(self, llm_client=None) -> str:
         """End the current session and create a summary.
@@ -140,7 +171,7 @@ class SessionManager:
                     }
                 ],
                 ids=[summary_id],
-            )
+            ).result()
 
             session_id = self.current_session_id
 
@@ -231,7 +262,7 @@ class SessionManager:
                     try:
                         dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
                         formatted_time = dt.strftime("%Y-%m-%d %H:%M")
-                    except Exception:
+                    except (ValueError, AttributeError):
                         formatted_time = timestamp
 
                     session_summaries.append(
@@ -487,7 +518,7 @@ Please generate a comprehensive but concise summary following the template above
                     end_formatted = end_dt.strftime("%Y-%m-%d %H:%M")
                 else:
                     end_formatted = "Unknown"
-            except Exception:
+            except (ValueError, AttributeError):
                 start_formatted = start_time
                 end_formatted = end_time
 
@@ -554,24 +585,29 @@ Unable to generate session summary due to error: {e}
             os.makedirs(sessions_dir, exist_ok=True)
 
             print("  - Finding next session number...")
-            # Find the next sequential number
-            existing_files = [
-                f
-                for f in os.listdir(sessions_dir)
-                if f.startswith("session_") and f.endswith(".md")
-            ]
-            session_numbers = []
-
-            for filename in existing_files:
-                try:
-                    # Extract number from filename like "session_001.md"
-                    number_part = filename.replace("session_", "").replace(".md", "")
-                    session_numbers.append(int(number_part))
-                except ValueError:
-                    continue
+            # Find the next sequential number, streaming the directory
+            # entries rather than building a list of every filename
+            last_number = 0
+            with os.scandir(sessions_dir) as entries:
+                for entry in entries:
+                    filename = entry.name
+                    if not (
+                        filename.startswith("session_")
+                        and filename.endswith(".md")
+                        and entry.is_file()
+                    ):
+                        continue
+                    try:
+                        # Extract number from filename like "session_001.md"
+                        number_part = filename.replace("session_", "").replace(
+                            ".md", ""
+                        )
+                        last_number = max(last_number, int(number_part))
+                    except ValueError:
+                        continue
 
             # Get next number
-            next_number = max(session_numbers, default=0) + 1
+            next_number = last_number + 1
             print(f"  - Using session number: {next_number:03d}")
 
             # Create filename with zero-padded number
@@ -1,14 +1,72 @@
 # -*- coding: utf-8 -*-
 """World state management for tracking story progression and context."""
 
-import json
+import atexit
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from functools import wraps
 from datetime import datetime
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, List, Optional, TypeVar, Union
+from dataclasses import dataclass, fields
+
+import orjson
 
 from ..database.chroma_client import ChromaClient
 from ..content.embeddings import EmbeddingManager
 
+# Only the most recent events are kept to prevent bloat
+MAX_IMPORTANT_EVENTS = 20
+
+# Number of recorded deltas after which a fresh snapshot is written
+DELTA_COMPACT_THRESHOLD = 50
+
+# Placeholder vector for delta log entries, which are never searched
+_DELTA_EMBEDDING = [0.0]
+
+# Relationship statuses worth surfacing in the context summary
+_KEY_REL_STATUSES = frozenset({"friendly", "hostile", "romantic", "enemy"})
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively."""
+    if isinstance(obj, deque):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def _needs_state(method: _F) -> _F:
+    """Load the world state before running a WorldStateManager method.
+
+    The state is loaded lazily on first use, since ChromaDB is not ready
+    when the manager is constructed.
+
+    Args:
+        method: Method that reads or modifies ``self.current_state``
+
+    Returns:
+        Wrapped method
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.current_state is None:
+            self.load_world_state()
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _recent(events: Deque[str], count: int) -> List[str]:
+    """Return the last ``count`` events without copying the whole deque."""
+    return list(islice(events, max(len(events) - count, 0), None))
+
 
 @dataclass
 class WorldState:
@@ -33,12 +91,12 @@ class WorldState:
 
     # Story flags and triggers
     story_flags: Dict[str, bool] = None  # flag_name -> is_active
-    important_events: List[str] = None  # List of significant events that occurred
+    important_events: Deque[str] = None  # Significant events that occurred
 
     # Session tracking
     current_session_number: int = 0
     total_sessions_played: int = 0
-    last_updated: str = ""
+    last_updated: Optional[datetime] = None
 
     def __post_init__(self):
         """Initialize empty collections if None."""
@@ -54,10 +112,128 @@ class WorldState:
             self.faction_reputation = {}
         if self.story_flags is None:
             self.story_flags = {}
-        if self.important_events is None:
-            self.important_events = []
+        self.important_events = deque(
+            self.important_events or (), maxlen=MAX_IMPORTANT_EVENTS
+        )
         if not self.last_updated:
-            self.last_updated = datetime.now().isoformat()
+            self.last_updated = datetime.now()
+        elif isinstance(self.last_updated, str):
+            self.last_updated = datetime.fromisoformat(self.last_updated)
+
+
+# Stored snapshots are a version tag followed by the WorldState fields in
+# declaration order. Append new fields at the end and bump the tag when an
+# existing field changes meaning.
+_STATE_SCHEMA_TAG = "v1"
+_STATE_FIELDS = tuple(field.name for field in fields(WorldState))
+
+
+def _encode_state(state: WorldState) -> bytes:
+    """Serialize a world state as a positional, version-tagged JSON array.
+
+    Args:
+        state: World state to serialize
+
+    Returns:
+        JSON document without repeated field names
+    """
+    return orjson.dumps(
+        [_STATE_SCHEMA_TAG, *(getattr(state, name) for name in _STATE_FIELDS)],
+        default=_orjson_default,
+    )
+
+
+def _decode_any(raw: Union[str, bytes]) -> WorldState:
+    """Deserialize a world state stored in either the positional or dict form.
+
+    Args:
+        raw: Stored JSON document
+
+    Returns:
+        Decoded world state
+    """
+    data = orjson.loads(raw)
+    if isinstance(data, list):
+        if not data or data[0] != _STATE_SCHEMA_TAG:
+            raise ValueError(f"Unsupported world state schema: {data[:1]}")
+        return WorldState(**dict(zip(_STATE_FIELDS, data[1:])))
+    # Snapshots written before the positional schema
+    return WorldState(**data)
+
+
+def _apply_delta(state: WorldState, delta: Dict[str, Any]):
+    """Apply a single recorded change to a world state.
+
+    Live updates and replay of the delta log both go through here, so a
+    replayed state always matches the one that was recorded.
+
+    Args:
+        state: World state to modify in place
+        delta: Change produced by one of the WorldStateManager mutators
+    """
+    op = delta["op"]
+    if op == "set":
+        for field_name, value in delta["values"].items():
+            setattr(state, field_name, value)
+    elif op == "quest":
+        quest_lists = {
+            "active": state.active_quests,
+            "completed": state.completed_quests,
+            "failed": state.failed_quests,
+        }
+        # Remove from other lists if it exists
+        for quest_list in quest_lists.values():
+            if delta["name"] in quest_list:
+                quest_list.remove(delta["name"])
+        if delta["status"] in quest_lists:
+            quest_lists[delta["status"]].append(delta["name"])
+    elif op == "relationship":
+        state.character_relationships[delta["name"]] = delta["status"]
+    elif op == "flag":
+        state.story_flags[delta["name"]] = delta["value"]
+    elif op == "event":
+        # The deque is bounded, so the oldest event is evicted automatically
+        state.important_events.append(delta["event"])
+    else:
+        raise ValueError(f"Unknown world state change: {op}")
+
+
+def _next_delta_seq(last_seq: int, ts: float) -> int:
+    """Get the sequence number for a new delta.
+
+    Sequence numbers are microsecond timestamps, bumped past the previous
+    number when the clock has not moved on, so they increase within one
+    manager and are unique across managers sharing the store.
+
+    Args:
+        last_seq: Sequence number of the previous delta
+        ts: Time of the change, as returned by ``time.time()``
+
+    Returns:
+        Sequence number greater than ``last_seq``
+    """
+    return max(last_seq + 1, int(ts * 1_000_000))
+
+
+@dataclass(frozen=True)
+class _StateSnapshot:
+    """Immutable copy of everything needed to persist one world state."""
+
+    state_json: str
+    summary: str
+    metadata: Dict[str, Any]
+    last_updated: datetime
+    delta_seq: int
+
+
+@dataclass(frozen=True)
+class _DeltaRecord:
+    """A single serialized world state change waiting to be written."""
+
+    seq: int
+    ts: float
+    op: str
+    delta_json: str
 
 
 class WorldStateManager:
@@ -77,69 +253,331 @@ class WorldStateManager:
         self.current_state: Optional[WorldState] = None
         self._state_id = "current_world_state"
 
+        # Mutations are persisted as small deltas on top of the last full
+        # snapshot. The sequence number orders them for replay and records
+        # which deltas a snapshot already covers. It is seeded from the store
+        # on load and follows the clock, so managers sharing a database never
+        # reuse each other's numbers. Deltas are tagged with the state ID and
+        # only this state's deltas are replayed or compacted; each state ID
+        # must have a single writing manager.
+        self._delta_seq = 0
+        self._deltas_since_snapshot = 0
+
+        # Cleared when the stored state could not be read, so a default state
+        # built in its place is never written over the user's saved campaign
+        self._can_persist = True
+
+        # Event timestamps have minute resolution, so the formatted string is
+        # cached and only rebuilt when the minute changes
+        self._event_minute = -1
+        self._event_stamp = ""
+
+        # Writes are handed to a single background writer so mutators never
+        # block on embedding or ChromaDB writes. None stops the writer.
+        self._write_q: "queue.Queue[Optional[Union[_DeltaRecord, _StateSnapshot]]]" = (
+            queue.Queue()
+        )
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="world-state-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.flush)
+
     def load_world_state(self) -> WorldState:
         """Load the current world state from the database.
 
+        The last snapshot is loaded and any deltas recorded after it are
+        replayed on top.
+
         Returns:
             Current world state
         """
+        # Make sure any pending write has landed before reading it back
+        self.flush()
+
         try:
+            self._can_persist = True
             collection = self.chroma_client.get_collection("world_state")
             results = collection.get(ids=[self._state_id])
 
-            if results["documents"] and results["documents"][0]:
-                state_data = json.loads(results["documents"][0])
-                self.current_state = WorldState(**state_data)
-                print(
-                    f"✓ Loaded world state: {self.current_state.current_location} ({self.current_state.current_act})"
-                )
+            has_snapshot = bool(results["documents"] and results["documents"][0])
+            if has_snapshot:
+                self.current_state = _decode_any(results["documents"][0])
+                base_seq = (results["metadatas"][0] or {}).get("delta_seq", 0)
             else:
-                # Create new world state
                 self.current_state = WorldState()
+                base_seq = 0
+
+            replayed = self._replay_deltas(base_seq)
+
+            if not has_snapshot:
+                # Create new world state
                 self.save_world_state()
                 print("✓ Created new world state")
+            else:
+                print(
+                    f"✓ Loaded world state: {self.current_state.current_location} ({self.current_state.current_act})"
+                )
+                if replayed >= DELTA_COMPACT_THRESHOLD:
+                    self.compact()
 
         except Exception as e:
-            print(f"Warning: Error loading world state, creating new: {e}")
+            # The stored state may only be temporarily unreadable, so work
+            # from a default state in memory without saving anything
+            print(
+                f"⚠ Warning: Error loading world state, using a default state "
+                f"that will not be saved: {e}"
+            )
             self.current_state = WorldState()
-            self.save_world_state()
+            self._can_persist = False
 
         return self.current_state
 
+    def _replay_deltas(self, base_seq: int) -> int:
+        """Apply deltas recorded after a snapshot to the current state.
+
+        Args:
+            base_seq: Sequence number of the last delta the snapshot covers
+
+        Returns:
+            Number of deltas replayed
+        """
+        collection = self.chroma_client.get_collection("world_state_deltas")
+        results = collection.get(where=self._deltas_where({"$gt": base_seq}))
+
+        records = sorted(
+            zip(results["metadatas"], results["documents"]),
+            key=lambda record: record[0]["seq"],
+        )
+        for metadata, document in records:
+            _apply_delta(self.current_state, orjson.loads(document))
+
+        if records:
+            last_metadata = records[-1][0]
+            self.current_state.last_updated = datetime.fromtimestamp(
+                last_metadata["ts"]
+            )
+            self._delta_seq = last_metadata["seq"]
+        else:
+            self._delta_seq = base_seq
+        self._deltas_since_snapshot = len(records)
+        return len(records)
+
+    def _deltas_where(self, seq_filter: Dict[str, int]) -> Dict[str, Any]:
+        """Build a where clause selecting this state's deltas by sequence.
+
+        Args:
+            seq_filter: Comparison on the sequence number, e.g. ``{"$gt": 5}``
+
+        Returns:
+            ChromaDB where clause
+        """
+        return {"$and": [{"state_id": self._state_id}, {"seq": seq_filter}]}
+
     def save_world_state(self):
-        """Save the current world state to the database."""
-        if not self.current_state:
+        """Queue a full snapshot of the current world state.
+
+        The state is serialized immediately; embedding and the database write
+        happen on the background writer thread. Once the snapshot is stored,
+        the deltas it covers are deleted. Call flush() to wait for it.
+        Nothing is saved if the stored state could not be loaded.
+        """
+        if not self.current_state or not self._can_persist:
             return
 
         try:
-            self.current_state.last_updated = datetime.now().isoformat()
-            state_json = json.dumps(asdict(self.current_state))
+            self.current_state.last_updated = datetime.now()
+            snapshot = _StateSnapshot(
+                state_json=_encode_state(self.current_state).decode(),
+                summary=self._create_state_summary(),
+                metadata={
+                    "state_id": self._state_id,
+                    "current_act": self.current_state.current_act,
+                    "current_location": self.current_state.current_location,
+                    "session_number": self.current_state.current_session_number,
+                    "content_type": "world_state",
+                },
+                last_updated=self.current_state.last_updated,
+                delta_seq=self._delta_seq,
+            )
+        except Exception as e:
+            print(f"Warning: Error saving world state: {e}")
+            return
 
-            # Create embedding for the world state (for semantic search)
-            state_summary = self._create_state_summary()
-            embedding = self.embedding_manager.embed_query(state_summary)
+        self._deltas_since_snapshot = 0
+        self._write_q.put(snapshot)
+
+    def compact(self):
+        """Fold recorded deltas into a fresh snapshot and drop them."""
+        if self.current_state and self._deltas_since_snapshot:
+            self.save_world_state()
+
+    def flush(self):
+        """Block until all queued world state writes have been stored."""
+        # The writer waits for each of its ChromaDB writes to be applied
+        self._write_q.join()
+
+    def close(self):
+        """Store pending writes and stop the background writer thread.
+
+        The manager must not be modified after it is closed.
+        """
+        if not self._writer.is_alive():
+            return
+
+        self._write_q.put(None)
+        self._writer.join()
+        atexit.unregister(self.flush)
+
+    def _commit(self, delta: Dict[str, Any], ts: Optional[float] = None):
+        """Apply a change to the current state and queue it for persistence.
+
+        Args:
+            delta: Change to apply, in the form understood by _apply_delta
+            ts: Time of the change from ``time.time()``, if the caller already
+                read the clock for the change itself
+        """
+        # Read the clock once so the state, sequence number and stored
+        # timestamp all agree
+        if ts is None:
+            ts = time.time()
+        _apply_delta(self.current_state, delta)
+        self.current_state.last_updated = datetime.fromtimestamp(ts)
+        if not self._can_persist:
+            return
+
+        self._delta_seq = _next_delta_seq(self._delta_seq, ts)
+        self._deltas_since_snapshot += 1
+        self._write_q.put(
+            _DeltaRecord(
+                seq=self._delta_seq,
+                ts=ts,
+                op=delta["op"],
+                delta_json=orjson.dumps(delta).decode(),
+            )
+        )
+
+        if self._deltas_since_snapshot >= DELTA_COMPACT_THRESHOLD:
+            self.save_world_state()
 
-            # Save to database
+    def _writer_loop(self):
+        """Write queued deltas and snapshots to the database until closed."""
+        stopping = False
+        while not stopping:
+            # Drain everything queued so far and write it as one batch
+            jobs = [self._write_q.get()]
+            while True:
+                try:
+                    jobs.append(self._write_q.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = None in jobs
+            try:
+                self._write_jobs([job for job in jobs if job is not None])
+            finally:
+                for _ in jobs:
+                    self._write_q.task_done()
+
+    def _write_jobs(self, jobs: List[Union[_DeltaRecord, _StateSnapshot]]):
+        """Write a batch of queued deltas and snapshots in order.
+
+        Only the newest snapshot in the batch is written, and deltas queued
+        before it are skipped since the snapshot already contains them. If
+        the snapshot cannot be stored, those deltas are written instead.
+
+        Args:
+            jobs: Queued writes, oldest first
+        """
+        snapshot_indexes = [
+            i for i, job in enumerate(jobs) if isinstance(job, _StateSnapshot)
+        ]
+        if snapshot_indexes:
+            last = snapshot_indexes[-1]
+            if not self._do_save(jobs[last]):
+                jobs = [job for job in jobs if isinstance(job, _DeltaRecord)]
+            else:
+                jobs = jobs[last + 1 :]
+
+        self._write_deltas(jobs)
+
+    def _write_deltas(self, records: List[_DeltaRecord]):
+        """Append delta records to the delta log in one write.
+
+        Args:
+            records: Deltas to store
+        """
+        if not records:
+            return
+
+        try:
             self.chroma_client.add_documents(
-                "world_state",
-                documents=[state_json],
+                "world_state_deltas",
+                documents=[record.delta_json for record in records],
                 metadatas=[
                     {
                         "state_id": self._state_id,
-                        "current_act": self.current_state.current_act,
-                        "current_location": self.current_state.current_location,
-                        "session_number": self.current_state.current_session_number,
-                        "last_updated": self.current_state.last_updated,
-                        "content_type": "world_state",
+                        "seq": record.seq,
+                        "ts": record.ts,
+                        "type": record.op,
                     }
+                    for record in records
                 ],
+                ids=[f"delta_{uuid.uuid4().hex}" for record in records],
+                # Deltas are never searched semantically; an explicit
+                # placeholder stops Chroma from embedding each document
+                embeddings=[_DELTA_EMBEDDING] * len(records),
+            ).result()
+
+        except Exception as e:
+            print(f"Warning: Error saving world state changes: {e}")
+
+    def _do_save(self, snapshot: _StateSnapshot) -> bool:
+        """Embed and store a world state snapshot, then compact the delta log.
+
+        Args:
+            snapshot: Serialized world state to store
+
+        Returns:
+            True if the snapshot was stored
+        """
+        try:
+            # Create embedding for the world state (for semantic search)
+            embedding = self.embedding_manager.embed_query(snapshot.summary)
+
+            # Timestamps are only formatted here, off the mutator path
+            metadata = {
+                **snapshot.metadata,
+                "last_updated": snapshot.last_updated.isoformat(),
+                "delta_seq": snapshot.delta_seq,
+            }
+
+            # Save to database, replacing the previous snapshot. Wait for it,
+            # since the deltas must survive if the snapshot is not stored.
+            self.chroma_client.upsert_documents(
+                "world_state",
+                documents=[snapshot.state_json],
+                metadatas=[metadata],
                 ids=[self._state_id],
                 embeddings=[embedding],
-            )
+            ).result()
 
         except Exception as e:
             print(f"Warning: Error saving world state: {e}")
+            return False
 
+        try:
+            # The snapshot now covers these deltas. Leftovers are harmless,
+            # since loading only replays deltas newer than the snapshot.
+            self.chroma_client.delete_from_collection(
+                "world_state_deltas",
+                where=self._deltas_where({"$lte": snapshot.delta_seq}),
+            ).result()
+        except Exception as e:
+            print(f"Warning: Error compacting world state changes: {e}")
+        return True
+
+    @_needs_state
     def update_location(self, new_location: str, is_significant: bool = True):
         """Update the current location.
 
@@ -147,18 +585,18 @@ class WorldStateManager:
             new_location: New location name
             is_significant: Whether this is a significant location change
         """
-        if not self.current_state:
-            self.load_world_state()
+        # Skip the save when the location is simply re-reported
+        if self.current_state.current_location == new_location:
+            return
 
+        values = {"current_location": new_location}
         if is_significant and self.current_state.current_location != "Unknown":
-            self.current_state.last_significant_location = (
-                self.current_state.current_location
-            )
+            values["last_significant_location"] = self.current_state.current_location
 
-        self.current_state.current_location = new_location
-        self.save_world_state()
+        self._commit({"op": "set", "values": values})
         print(f"📍 Location updated: {new_location}")
 
+    @_needs_state
     def update_story_progression(self, act: str = None, arc: str = None):
         """Update story progression markers.
 
@@ -166,19 +604,19 @@ class WorldStateManager:
             act: New act (e.g., "Act II")
             arc: New arc (e.g., "Arc D")
         """
-        if not self.current_state:
-            self.load_world_state()
-
+        values = {}
         if act:
-            self.current_state.current_act = act
+            values["current_act"] = act
         if arc:
-            self.current_state.current_arc = arc
+            values["current_arc"] = arc
 
-        self.save_world_state()
+        if values:
+            self._commit({"op": "set", "values": values})
         print(
             f"📖 Story progression updated: {self.current_state.current_act}, {self.current_state.current_arc}"
         )
 
+    @_needs_state
     def add_quest(self, quest_name: str, quest_type: str = "active"):
         """Add a quest to tracking.
 
@@ -186,29 +624,10 @@ class WorldStateManager:
             quest_name: Name of the quest
             quest_type: Type of quest (active, completed, failed)
         """
-        if not self.current_state:
-            self.load_world_state()
-
-        # Remove from other lists if it exists
-        for quest_list in [
-            self.current_state.active_quests,
-            self.current_state.completed_quests,
-            self.current_state.failed_quests,
-        ]:
-            if quest_name in quest_list:
-                quest_list.remove(quest_name)
-
-        # Add to appropriate list
-        if quest_type == "active":
-            self.current_state.active_quests.append(quest_name)
-        elif quest_type == "completed":
-            self.current_state.completed_quests.append(quest_name)
-        elif quest_type == "failed":
-            self.current_state.failed_quests.append(quest_name)
-
-        self.save_world_state()
+        self._commit({"op": "quest", "name": quest_name, "status": quest_type})
         print(f"🎯 Quest {quest_type}: {quest_name}")
 
+    @_needs_state
     def update_character_relationship(
         self, character_name: str, relationship_status: str
     ):
@@ -218,13 +637,20 @@ class WorldStateManager:
             character_name: Name of the character
             relationship_status: Relationship status (e.g., "friendly", "hostile", "neutral")
         """
-        if not self.current_state:
-            self.load_world_state()
+        relationships = self.current_state.character_relationships
+        if relationships.get(character_name) == relationship_status:
+            return
 
-        self.current_state.character_relationships[character_name] = relationship_status
-        self.save_world_state()
+        self._commit(
+            {
+                "op": "relationship",
+                "name": character_name,
+                "status": relationship_status,
+            }
+        )
         print(f"👥 Relationship updated: {character_name} -> {relationship_status}")
 
+    @_needs_state
     def set_story_flag(self, flag_name: str, value: bool = True):
         """Set a story flag.
 
@@ -232,101 +658,102 @@ class WorldStateManager:
             flag_name: Name of the flag
             value: Flag value
         """
-        if not self.current_state:
-            self.load_world_state()
+        if self.current_state.story_flags.get(flag_name) == value:
+            return
 
-        self.current_state.story_flags[flag_name] = value
-        self.save_world_state()
+        self._commit({"op": "flag", "name": flag_name, "value": value})
         print(f"🚩 Story flag set: {flag_name} = {value}")
 
+    @_needs_state
     def add_important_event(self, event_description: str):
         """Add an important event to the history.
 
         Args:
             event_description: Description of the event
         """
-        if not self.current_state:
-            self.load_world_state()
+        ts = time.time()
+        event_with_timestamp = f"[{self._event_timestamp(ts)}] {event_description}"
+        self._commit({"op": "event", "event": event_with_timestamp}, ts)
+        print(f"📝 Important event recorded: {event_description}")
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-        event_with_timestamp = f"[{timestamp}] {event_description}"
-        self.current_state.important_events.append(event_with_timestamp)
+    def _event_timestamp(self, ts: float) -> str:
+        """Get the minute of a point in time formatted for event history.
 
-        # Keep only the last 20 events to prevent bloat
-        if len(self.current_state.important_events) > 20:
-            self.current_state.important_events = self.current_state.important_events[
-                -20:
-            ]
+        Args:
+            ts: Time of the event from ``time.time()``
 
-        self.save_world_state()
-        print(f"📝 Important event recorded: {event_description}")
+        Returns:
+            Timestamp string in ``YYYY-MM-DD HH:MM`` format
+        """
+        minute = int(ts // 60)
+        if minute != self._event_minute:
+            self._event_minute = minute
+            self._event_stamp = datetime.fromtimestamp(minute * 60).strftime(
+                "%Y-%m-%d %H:%M"
+            )
+        return self._event_stamp
 
+    @_needs_state
     def start_new_session(self, session_number: int):
         """Start a new session and update session tracking.
 
         Args:
             session_number: Session number
         """
-        if not self.current_state:
-            self.load_world_state()
-
-        self.current_state.current_session_number = session_number
-        self.current_state.total_sessions_played = max(
-            self.current_state.total_sessions_played, session_number
+        self._commit(
+            {
+                "op": "set",
+                "values": {
+                    "current_session_number": session_number,
+                    "total_sessions_played": max(
+                        self.current_state.total_sessions_played, session_number
+                    ),
+                },
+            }
         )
-        self.save_world_state()
         print(f"🎲 Session {session_number} started")
 
+    @_needs_state
     def get_current_context_summary(self) -> str:
         """Get a summary of the current world state for context.
 
         Returns:
             Formatted context summary
         """
-        if not self.current_state:
-            self.load_world_state()
-
-        summary_parts = []
-
-        # Story progression
-        summary_parts.append(
-            f"**Current Story Position**: {self.current_state.current_act}, {self.current_state.current_arc}"
-        )
-        summary_parts.append(
-            f"**Current Location**: {self.current_state.current_location}"
-        )
-
-        # Active quests
-        if self.current_state.active_quests:
-            summary_parts.append(
-                f"**Active Quests**: {', '.join(self.current_state.active_quests)}"
-            )
-
-        # Recent events
-        if self.current_state.important_events:
-            recent_events = self.current_state.important_events[-3:]  # Last 3 events
-            summary_parts.append("**Recent Important Events**:")
-            for event in recent_events:
-                summary_parts.append(f"  - {event}")
-
-        # Key relationships
-        if self.current_state.character_relationships:
-            key_relationships = [
-                (k, v)
-                for k, v in self.current_state.character_relationships.items()
-                if v in ["friendly", "hostile", "romantic", "enemy"]
+        state = self.current_state
+        recent_events = _recent(state.important_events, 3)
+        key_relationships = [
+            f"  - {char}: {status}"
+            for char, status in state.character_relationships.items()
+            if status in _KEY_REL_STATUSES
+        ]
+        active_flags = [k for k, v in state.story_flags.items() if v]
+
+        return "\n".join(
+            [
+                # Story progression
+                f"**Current Story Position**: {state.current_act}, {state.current_arc}",
+                f"**Current Location**: {state.current_location}",
+                # Active quests
+                *(
+                    [f"**Active Quests**: {', '.join(state.active_quests)}"]
+                    if state.active_quests
+                    else []
+                ),
+                # Recent events
+                *(["**Recent Important Events**:"] if recent_events else []),
+                *[f"  - {event}" for event in recent_events],
+                # Key relationships
+                *(["**Key Character Relationships**:"] if key_relationships else []),
+                *key_relationships,
+                # Active story flags
+                *(
+                    [f"**Active Story Flags**: {', '.join(active_flags)}"]
+                    if active_flags
+                    else []
+                ),
             ]
-            if key_relationships:
-                summary_parts.append("**Key Character Relationships**:")
-                for char, status in key_relationships:
-                    summary_parts.append(f"  - {char}: {status}")
-
-        # Active story flags
-        active_flags = [k for k, v in self.current_state.story_flags.items() if v]
-        if active_flags:
-            summary_parts.append(f"**Active Story Flags**: {', '.join(active_flags)}")
-
-        return "\n".join(summary_parts)
+        )
 
     def _create_state_summary(self) -> str:
         """Create a text summary of the world state for embedding.
@@ -349,11 +776,12 @@ class WorldStateManager:
             )
 
         if self.current_state.important_events:
-            recent_events = self.current_state.important_events[-2:]
+            recent_events = _recent(self.current_state.important_events, 2)
             summary_parts.append(f"Recent events: {'; '.join(recent_events)}")
 
         return " | ".join(summary_parts)
 
+    @_needs_state
     def get_story_relevance_context(self, query: str) -> Dict[str, Any]:
         """Get story relevance context for query processing.
 
@@ -363,9 +791,6 @@ class WorldStateManager:
         Returns:
             Dictionary with story context for query processing
         """
-        if not self.current_state:
-            self.load_world_state()
-
         return {
             "current_act": self.current_state.current_act,
             "current_arc": self.current_state.current_arc,
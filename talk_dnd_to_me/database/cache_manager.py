@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 """File cache management for content loading."""
 
-import json
+from concurrent.futures import Future
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+import orjson
 
 from .chroma_client import ChromaClient
-from ..utils.file_utils import get_file_hash, get_md5_hash
+from ..utils.file_utils import get_file_hash, get_text_key
 
 
 class CacheManager:
@@ -20,6 +22,10 @@ class CacheManager:
         """
         self.chroma_client = chroma_client
 
+    def drain(self):
+        """Block until all queued cache updates have been written."""
+        self.chroma_client.flush()
+
     def check_file_cache(self, file_path: str) -> bool:
         """Check if file is cached and unchanged.
 
@@ -34,11 +40,11 @@ class CacheManager:
             if not current_hash:
                 return False
 
-            cache_id = f"cache_{get_md5_hash(file_path)}"
+            cache_id = f"cache_{get_text_key(file_path)}"
             results = self.chroma_client.get_documents("file_cache", [cache_id])
 
-            if results["documents"] and len(results["documents"]) > 0:
-                cached_data = json.loads(results["documents"][0])
+            if results["ids"]:
+                cached_data = orjson.loads(results["documents"][0])
                 return cached_data.get("file_hash") == current_hash
             return False
 
@@ -46,20 +52,84 @@ class CacheManager:
             print(f"Error checking cache for {file_path}: {e}")
             return False
 
+    def check_file_cache_bulk(self, file_paths: List[str]) -> Dict[str, str]:
+        """Look up the cached hashes of many files in a single query.
+
+        Args:
+            file_paths: Paths of the files to look up
+
+        Returns:
+            Mapping of file path to cached hash for files that have a cache
+            entry; callers compare these against freshly computed hashes
+        """
+        return {
+            file_path: entry.get("file_hash")
+            for file_path, entry in self._get_cache_entries(file_paths).items()
+        }
+
+    def get_cached_chunks_bulk(self, file_paths: List[str]) -> Dict[str, List[str]]:
+        """Get cached chunk IDs for many files in a single query.
+
+        Args:
+            file_paths: Paths of the files to look up
+
+        Returns:
+            Mapping of file path to cached chunk IDs for files that have a
+            cache entry
+        """
+        return {
+            file_path: entry.get("chunk_ids", [])
+            for file_path, entry in self._get_cache_entries(file_paths).items()
+        }
+
+    def _get_cache_entries(self, file_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch and parse cache entries for many files with one ID lookup.
+
+        Args:
+            file_paths: Paths of the files to look up
+
+        Returns:
+            Mapping of file path to its parsed cache entry
+        """
+        if not file_paths:
+            return {}
+
+        try:
+            ids_to_paths = {
+                f"cache_{get_text_key(file_path)}": file_path
+                for file_path in file_paths
+            }
+            results = self.chroma_client.get_documents("file_cache", list(ids_to_paths))
+            return {
+                ids_to_paths[cache_id]: orjson.loads(document)
+                for cache_id, document in zip(results["ids"], results["documents"])
+            }
+
+        except Exception as e:
+            print(f"Warning: Error loading cache entries: {e}")
+            return {}
+
     def update_file_cache(
         self,
         file_path: str,
         file_hash: str,
         chunk_ids: List[str],
         metadata: Dict[str, Any],
-    ):
-        """Update file cache with new hash and chunk references.
+    ) -> Optional[Future]:
+        """Queue an update of the file cache with new hash and chunk references.
+
+        The write is applied by the ChromaDB client's background writer; call
+        drain() to wait for all queued updates. Cache reads wait automatically.
 
         Args:
             file_path: Path to the file
-            file_hash: SHA256 hash of the file
+            file_hash: Content hash from get_file_hash
             chunk_ids: List of chunk IDs for this file
             metadata: File metadata
+
+        Returns:
+            Future that completes once the entry is written, or None if the
+            update could not be queued
         """
         try:
             cache_data = {
@@ -70,19 +140,11 @@ class CacheManager:
                 "metadata": metadata,
             }
 
-            # Remove existing cache entry
-            try:
-                self.chroma_client.delete_from_collection(
-                    "file_cache", where={"file_path": file_path}
-                )
-            except Exception:
-                pass
-
-            # Add new cache entry
-            cache_id = f"cache_{get_md5_hash(file_path)}"
-            self.chroma_client.add_documents(
+            # Replace any existing cache entry in one write
+            cache_id = f"cache_{get_text_key(file_path)}"
+            future = self.chroma_client.upsert_documents(
                 "file_cache",
-                documents=[json.dumps(cache_data)],
+                documents=[orjson.dumps(cache_data).decode()],
                 metadatas=[
                     {
                         "file_path": file_path,
@@ -91,10 +153,28 @@ class CacheManager:
                 ],
                 ids=[cache_id],
             )
-            print(f"✓ Updated cache for {file_path.split('/')[-1]}")
 
         except Exception as e:
             print(f"Error updating cache for {file_path}: {e}")
+            return None
+
+        future.add_done_callback(
+            lambda done: self._report_update(file_path, done.exception())
+        )
+        return future
+
+    @staticmethod
+    def _report_update(file_path: str, error: Optional[BaseException]):
+        """Print the outcome of a cache write once it has been applied.
+
+        Args:
+            file_path: Path to the file
+            error: Exception raised by the write, or None if it succeeded
+        """
+        if error:
+            print(f"Error updating cache for {file_path}: {error}")
+        else:
+            print(f"✓ Updated cache for {file_path.split('/')[-1]}")
 
     def get_cached_chunks(self, file_path: str) -> List[str]:
         """Get cached chunk IDs for a file.
@@ -106,11 +186,11 @@ class CacheManager:
             List of cached chunk IDs
         """
         try:
-            cache_id = f"cache_{get_md5_hash(file_path)}"
+            cache_id = f"cache_{get_text_key(file_path)}"
             results = self.chroma_client.get_documents("file_cache", [cache_id])
 
-            if results["documents"] and len(results["documents"]) > 0:
-                cached_data = json.loads(results["documents"][0])
+            if results["ids"]:
+                cached_data = orjson.loads(results["documents"][0])
                 return cached_data.get("chunk_ids", [])
             return []
 
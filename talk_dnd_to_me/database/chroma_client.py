@@ -2,7 +2,13 @@
 """ChromaDB client wrapper."""
 
 import chromadb
-from typing import Optional, List, Dict, Any
+import atexit
+import queue
+import sqlite3
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple
 import os
 import shutil
 
@@ -20,8 +26,38 @@ class ChromaClient:
         """
         self.config = config
         self.client: Optional[chromadb.Client] = None
+        # Collection type -> collection object, populated by initialize()
         self.collections: Dict[str, Any] = {}
 
+        # Collection type -> collection name, resolved once from the config
+        self._type_to_name: Dict[str, str] = {
+            "campaign_reference": config.campaign_reference_collection,
+            "session_history": config.session_history_collection,
+            "current_session": config.current_session_collection,
+            "character_data": config.character_collection,
+            "world_state": config.world_state_collection,
+            "world_state_deltas": config.world_state_delta_collection,
+            "file_cache": config.cache_collection,
+        }
+
+        # Writes (add, upsert, delete) are applied in order by one background
+        # thread so callers don't wait for the SQLite commit. Reads first wait
+        # for the queued writes to the same collection, so they always see
+        # them. Each write has a Future that carries its outcome back to the
+        # caller, which is responsible for reporting a failure.
+        self._write_q: (
+            "queue.Queue[Optional[Tuple[str, str, Dict[str, Any], Future]]]"
+        ) = queue.Queue()
+        # Collection type -> number of queued or running writes
+        self._queued_writes: Counter = Counter()
+        self._writes_done = threading.Condition()
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="chroma-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
     def initialize(self) -> bool:
         """Initialize ChromaDB client and collections.
 
@@ -41,26 +77,18 @@ class ChromaClient:
             # Initialize ChromaDB with the specified persistence directory
             self.client = chromadb.PersistentClient(path=db_path)
             print(f"✓ ChromaDB initialized with persistence at: {db_path}")
-
-            # Initialize all standardized collections
-            collection_names = [
-                self.config.campaign_reference_collection,
-                self.config.session_history_collection,
-                self.config.current_session_collection,
-                self.config.character_collection,
-                self.config.world_state_collection,
-                self.config.cache_collection,
-            ]
-
-            for name in collection_names:
-                try:
-                    collection = self.client.get_collection(name)
-                    print(f"✓ Using existing {name} collection")
-                except Exception:
-                    collection = self.client.create_collection(name)
-                    print(f"✓ Created {name} collection")
-
-                self.collections[name] = collection
+            self._enable_wal(db_path)
+
+            # Initialize all standardized collections concurrently; each
+            # lookup is an independent query against the same client
+            types = list(self._type_to_name)
+            names = list(self._type_to_name.values())
+            with ThreadPoolExecutor(max_workers=len(names)) as executor:
+                for collection_type, collection in zip(
+                    types, executor.map(self.client.get_or_create_collection, names)
+                ):
+                    self.collections[collection_type] = collection
+            print(f"✓ Ready: {len(names)} collections ({', '.join(names)})")
 
             return True
 
@@ -68,29 +96,60 @@ class ChromaClient:
             print(f"✗ Error setting up ChromaDB: {e}")
             return False
 
+    def _enable_wal(self, db_path: str):
+        """Switch the ChromaDB SQLite database to write-ahead logging.
+
+        WAL lets readers proceed during writes and commits faster than the
+        default rollback journal. The mode is stored in the database file, so
+        it also applies to ChromaDB's own connections. SQLite keeps
+        ``-wal``/``-shm`` sidecar files next to the database while it is open.
+
+        Args:
+            db_path: ChromaDB persistence directory
+        """
+        try:
+            conn = sqlite3.connect(os.path.join(db_path, "chroma.sqlite3"))
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠ Warning: Could not enable SQLite WAL mode: {e}")
+
     def get_collection(self, collection_type: str):
         """Get a collection by type.
 
+        Queued writes to this collection are applied first, since callers
+        may read from the returned collection directly.
+
         Args:
             collection_type: Type of collection (content, history, character, cache)
 
         Returns:
             ChromaDB collection object
         """
-        collection_map = {
-            "campaign_reference": self.config.campaign_reference_collection,
-            "session_history": self.config.session_history_collection,
-            "current_session": self.config.current_session_collection,
-            "character_data": self.config.character_collection,
-            "world_state": self.config.world_state_collection,
-            "file_cache": self.config.cache_collection,
-        }
+        with self._writes_done:
+            self._writes_done.wait_for(lambda: not self._queued_writes[collection_type])
+        return self._resolve(collection_type)
 
-        collection_name = collection_map.get(collection_type)
-        if not collection_name:
-            raise ValueError(f"Unknown collection type: {collection_type}")
+    def _resolve(self, collection_type: str):
+        """Look up a collection by type without flushing queued writes.
 
-        return self.collections.get(collection_name)
+        Args:
+            collection_type: Type of collection
+
+        Returns:
+            ChromaDB collection object, or None before initialize()
+        """
+        try:
+            return self.collections[collection_type]
+        except KeyError:
+            if collection_type not in self._type_to_name:
+                raise ValueError(
+                    f"Unknown collection type: {collection_type}"
+                ) from None
+            # Known type, but initialize() has not run yet
+            return None
 
     def add_documents(
         self,
@@ -108,15 +167,41 @@ class ChromaClient:
             metadatas: List of metadata dictionaries
             ids: List of document IDs
             embeddings: Optional list of embeddings
+
+        Returns:
+            Future that completes once the write has been applied, raising
+            any error from ChromaDB
         """
-        collection = self.get_collection(collection_type)
+        kwargs = {"documents": documents, "metadatas": metadatas, "ids": ids}
+        if embeddings:
+            kwargs["embeddings"] = embeddings
+        return self._enqueue("add", collection_type, kwargs)
 
+    def upsert_documents(
+        self,
+        collection_type: str,
+        documents: List[str],
+        metadatas: List[Dict],
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None,
+    ):
+        """Insert documents, replacing any that already exist with the same IDs.
+
+        Args:
+            collection_type: Type of collection
+            documents: List of document texts
+            metadatas: List of metadata dictionaries
+            ids: List of document IDs
+            embeddings: Optional list of embeddings
+
+        Returns:
+            Future that completes once the write has been applied, raising
+            any error from ChromaDB
+        """
+        kwargs = {"documents": documents, "metadatas": metadatas, "ids": ids}
         if embeddings:
-            collection.add(
-                embeddings=embeddings, documents=documents, metadatas=metadatas, ids=ids
-            )
-        else:
-            collection.add(documents=documents, metadatas=metadatas, ids=ids)
+            kwargs["embeddings"] = embeddings
+        return self._enqueue("upsert", collection_type, kwargs)
 
     def query_collection(
         self,
@@ -152,20 +237,83 @@ class ChromaClient:
         collection_type: str,
         where: Optional[Dict] = None,
         ids: Optional[List[str]] = None,
-    ):
+    ) -> Optional[Future]:
         """Delete documents from a collection.
 
         Args:
             collection_type: Type of collection
             where: Where clause for filtering
             ids: Specific IDs to delete
-        """
-        collection = self.get_collection(collection_type)
 
+        Returns:
+            Future that completes once the delete has been applied, or None
+            if neither IDs nor a where clause were given
+        """
         if ids:
-            collection.delete(ids=ids)
-        elif where:
-            collection.delete(where=where)
+            return self._enqueue("delete", collection_type, {"ids": ids})
+        if where:
+            return self._enqueue("delete", collection_type, {"where": where})
+        return None
+
+    def flush(self):
+        """Block until all queued writes have been applied."""
+        self._write_q.join()
+
+    def close(self):
+        """Apply queued writes and stop the background writer thread.
+
+        No writes can be queued once the client is closed.
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        atexit.unregister(self.close)
+        self._write_q.put(None)
+        self._writer.join()
+
+    def _enqueue(self, op: str, collection_type: str, kwargs: Dict[str, Any]) -> Future:
+        """Queue a write for the background writer thread.
+
+        Args:
+            op: Collection method to call (add, upsert or delete)
+            collection_type: Type of collection
+            kwargs: Keyword arguments for the collection method
+
+        Returns:
+            Future for the outcome of the write
+        """
+        if self._closed:
+            raise RuntimeError("ChromaDB client is closed")
+        # Reject unknown collection types in the caller, not the writer
+        self._resolve(collection_type)
+        future: Future = Future()
+        with self._writes_done:
+            self._queued_writes[collection_type] += 1
+        self._write_q.put((op, collection_type, kwargs, future))
+        return future
+
+    def _writer_loop(self):
+        """Apply queued writes in order until close() queues None."""
+        while True:
+            item = self._write_q.get()
+            if item is None:
+                self._write_q.task_done()
+                return
+
+            op, collection_type, kwargs, future = item
+            try:
+                # Resolve at write time; a reset may have replaced the collection
+                getattr(self._resolve(collection_type), op)(**kwargs)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(None)
+            finally:
+                with self._writes_done:
+                    self._queued_writes[collection_type] -= 1
+                    self._writes_done.notify_all()
+                self._write_q.task_done()
 
     def get_documents(self, collection_type: str, ids: List[str]):
         """Get specific documents by ID.
@@ -188,6 +336,7 @@ class ChromaClient:
         """
         try:
             print("🔄 Resetting campaign progress...")
+            self.flush()
 
             # Collections to clear (progress data, not campaign content)
             collections_to_clear = [
@@ -195,36 +344,29 @@ class ChromaClient:
                 ("session_history", "session history summaries"),
                 ("character_data", "character data"),
                 ("world_state", "world state"),
+                ("world_state_deltas", "world state changes"),
                 ("file_cache", "file cache"),
             ]
 
             cleared_collections = []
 
-            for collection_type, description in collections_to_clear:
-                try:
-                    collection = self.get_collection(collection_type)
-                    if collection:
-                        all_docs = collection.get()
-                        if all_docs["ids"]:
-                            collection.delete(ids=all_docs["ids"])
-                            cleared_collections.append(description)
-                            print(f"✓ Cleared {description}")
-                        else:
-                            print(f"✓ {description} was already empty")
-                except Exception as e:
-                    print(f"⚠ Warning: Could not clear {description}: {e}")
-
-            # Clear Sessions folder
-            try:
-                sessions_dir = "Sessions"
-                if os.path.exists(sessions_dir):
-                    shutil.rmtree(sessions_dir)
-                    print("✓ Cleared session summaries folder")
-                    cleared_collections.append("session summary files")
-                else:
-                    print("✓ No session summaries folder to clear")
-            except Exception as e:
-                print(f"⚠ Warning: Could not clear Sessions folder: {e}")
+            # Each collection is dropped independently and the Sessions folder
+            # is on disk, so all of them are cleared concurrently. Results are
+            # printed afterwards in a fixed order.
+            with ThreadPoolExecutor(max_workers=len(collections_to_clear)) as executor:
+                sessions_future = executor.submit(self._clear_sessions_folder)
+                results = list(
+                    executor.map(
+                        lambda item: self._clear_collection(*item),
+                        collections_to_clear,
+                    )
+                )
+                results.append(sessions_future.result())
+
+            for cleared, message in results:
+                if cleared:
+                    cleared_collections.append(cleared)
+                print(message)
 
             print("\n✅ Campaign progress reset complete!")
             print("   Collections cleared:")
@@ -238,3 +380,49 @@ class ChromaClient:
         except Exception as e:
             print(f"❌ Error resetting progress: {e}")
             return False
+
+    def _clear_collection(
+        self, collection_type: str, description: str
+    ) -> Tuple[Optional[str], str]:
+        """Remove all documents from a collection by dropping and recreating it.
+
+        Dropping the collection avoids fetching every ID just to delete it.
+
+        Args:
+            collection_type: Type of collection
+            description: Human readable description for status messages
+
+        Returns:
+            Tuple of the description if anything was cleared (else None) and
+            a status message
+        """
+        try:
+            collection = self._resolve(collection_type)
+            if not collection or not collection.count():
+                return None, f"✓ {description} was already empty"
+
+            name = self._type_to_name[collection_type]
+            self.client.delete_collection(name)
+            self.collections[collection_type] = self.client.create_collection(name)
+            return description, f"✓ Cleared {description}"
+
+        except Exception as e:
+            return None, f"⚠ Warning: Could not clear {description}: {e}"
+
+    def _clear_sessions_folder(self) -> Tuple[Optional[str], str]:
+        """Remove the Sessions folder of session summary files.
+
+        Returns:
+            Tuple of a description if the folder was removed (else None) and
+            a status message
+        """
+        try:
+            sessions_dir = "Sessions"
+            if not os.path.exists(sessions_dir):
+                return None, "✓ No session summaries folder to clear"
+
+            shutil.rmtree(sessions_dir)
+            return "session summary files", "✓ Cleared session summaries folder"
+
+        except Exception as e:
+            return None, f"⚠ Warning: Could not clear Sessions folder: {e}"
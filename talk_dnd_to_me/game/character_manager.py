@@ -1,13 +1,76 @@
 # -*- coding: utf-8 -*-
 """Character management for tracking player and NPC information."""
 
-import json
+import atexit
 from datetime import datetime
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, Set, Tuple
+
+import orjson
 
 from ..database.chroma_client import ChromaClient
 
 
+@lru_cache(maxsize=512)
+def _char_id(character_name: str) -> str:
+    """Derive the stored character ID from a character name.
+
+    Args:
+        character_name: Name of the character
+
+    Returns:
+        Character ID used as the document ID
+    """
+    return "char_" + character_name.lower().replace(" ", "_")
+
+
+# Number of character updates kept in memory before they are saved
+_FLUSH_EVERY_UPDATES = 10
+
+# Character section changed by each dict-merging update type
+_UPDATE_SECTIONS = {
+    "inventory": "inventory",
+    "status": "campaign_data",
+    "relationship": "relationships",
+}
+
+
+def _is_unchanged(
+    character_data: Dict[str, Any], update_type: str, update_data: Dict[str, Any]
+) -> bool:
+    """Check whether an update would leave a character as it is.
+
+    Args:
+        character_data: Stored character data
+        update_type: Type of update (hp, inventory, status, relationship, location)
+        update_data: Data to update
+
+    Returns:
+        True if every updated value already matches the stored one
+    """
+    if update_type == "hp":
+        section = character_data.get("attributes", {}).get("hit_points")
+        values = {
+            key: update_data[key]
+            for key in ("current", "maximum")
+            if key in update_data
+        }
+    elif update_type == "location":
+        section = character_data.get("campaign_data")
+        values = {"current_location": update_data.get("location", "")}
+    elif update_type in _UPDATE_SECTIONS:
+        section = character_data.get(_UPDATE_SECTIONS[update_type])
+        values = update_data
+    else:
+        return False
+
+    if section is None:
+        return False
+    return all(
+        key in section and section[key] == value for key, value in values.items()
+    )
+
+
 class CharacterManager:
     """Manages character information and updates."""
 
@@ -20,14 +83,78 @@ class CharacterManager:
         self.chroma_client = chroma_client
         self.current_session_id: Optional[str] = None
 
+        # Characters are kept in memory once loaded and changed in place.
+        # Changed character IDs are saved in batches; using a set keeps only
+        # one pending write per character. A batch is saved after
+        # _FLUSH_EVERY_UPDATES updates, so a session that keeps changing the
+        # same few characters still saves them regularly.
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._pending: Set[str] = set()
+        # Character ID -> (last_updated, formatted info) for get_character_info
+        self._info_cache: Dict[str, Tuple[str, str]] = {}
+        self._unsaved_updates = 0
+        atexit.register(self.flush)
+
     def set_session_id(self, session_id: str):
         """Set the current session ID.
 
         Args:
             session_id: Current session identifier
         """
+        if session_id != self.current_session_id:
+            self.flush()
         self.current_session_id = session_id
 
+    def flush(self):
+        """Save all changed characters in a single upsert and wait for it."""
+        if not self._pending:
+            return
+
+        character_ids = list(self._pending)
+        self._pending.clear()
+        self._unsaved_updates = 0
+        characters = [self._cache[char_id] for char_id in character_ids]
+        try:
+            self.chroma_client.upsert_documents(
+                "character_data",
+                documents=[
+                    orjson.dumps(character).decode() for character in characters
+                ],
+                metadatas=[
+                    {
+                        "character_id": character["character_id"],
+                        "character_name": character["name"],
+                        "character_type": character.get("character_type", "unknown"),
+                        "last_updated": character["last_updated"],
+                    }
+                    for character in characters
+                ],
+                ids=character_ids,
+            ).result()
+        except Exception as e:
+            # Keep the characters pending so the next flush can retry them
+            self._pending.update(character_ids)
+            print(f"⚠ Warning: Could not save character updates: {e}")
+
+    def _load(self, character_id: str) -> Optional[Dict[str, Any]]:
+        """Get a character, loading it from the database on first use.
+
+        Args:
+            character_id: ID of the character
+
+        Returns:
+            Cached character data, or None if the character does not exist
+        """
+        character_data = self._cache.get(character_id)
+        if character_data is None:
+            results = self.chroma_client.get_documents(
+                "character_data", ids=[character_id]
+            )
+            if results["ids"]:
+                character_data = orjson.loads(results["documents"][0])
+                self._cache[character_id] = character_data
+        return character_data
+
     def update_character(
         self, character_name: str, update_type: str, update_data: Dict[str, Any]
     ) -> str:
@@ -42,22 +169,25 @@ class CharacterManager:
             Success or error message
         """
         try:
-            character_id = f"char_{character_name.lower().replace(' ', '_')}"
+            character_id = _char_id(character_name)
+            now_iso = datetime.now().isoformat()
 
             # Try to get existing character
-            results = self.chroma_client.query_collection(
-                "character", where={"character_id": character_id}, n_results=1
-            )
+            character_data = self._load(character_id)
 
-            if results["documents"] and len(results["documents"][0]) > 0:
-                character_data = json.loads(results["documents"][0][0])
-            else:
+            # Nothing to log or save when the update matches what is stored
+            if character_data is not None and _is_unchanged(
+                character_data, update_type, update_data
+            ):
+                return f"✓ {character_name}: no change"
+
+            if character_data is None:
                 # Create new character
                 character_data = {
                     "character_id": character_id,
                     "name": character_name,
                     "character_type": "unknown",
-                    "last_updated": datetime.now().isoformat(),
+                    "last_updated": now_iso,
                     "session_last_seen": self.current_session_id,
                     "attributes": {},
                     "inventory": {},
@@ -66,6 +196,7 @@ class CharacterManager:
                     "campaign_data": {},
                     "change_log": [],
                 }
+                self._cache[character_id] = character_data
 
             # Apply update based on type
             if update_type == "hp":
@@ -105,38 +236,21 @@ class CharacterManager:
             # Add to change log
             character_data["change_log"].append(
                 {
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso,
                     "change": f"Updated {update_type}: {update_data}",
                     "session": self.current_session_id,
                 }
             )
 
-            character_data["last_updated"] = datetime.now().isoformat()
+            character_data["last_updated"] = now_iso
             character_data["session_last_seen"] = self.current_session_id
 
-            # Save updated character
-            try:
-                self.chroma_client.delete_from_collection(
-                    "character", where={"character_id": character_id}
-                )
-            except Exception:
-                pass
-
-            self.chroma_client.add_documents(
-                "character",
-                documents=[json.dumps(character_data)],
-                metadatas=[
-                    {
-                        "character_id": character_id,
-                        "character_name": character_name,
-                        "character_type": character_data.get(
-                            "character_type", "unknown"
-                        ),
-                        "last_updated": character_data["last_updated"],
-                    }
-                ],
-                ids=[character_id],
-            )
+            # Save the character with the next batch
+            self._pending.add(character_id)
+            self._info_cache.pop(character_id, None)
+            self._unsaved_updates += 1
+            if self._unsaved_updates >= _FLUSH_EVERY_UPDATES:
+                self.flush()
 
             return f"✓ Updated {character_name}: {update_type} = {update_data}"
 
@@ -153,14 +267,14 @@ class CharacterManager:
             Formatted character information or error message
         """
         try:
-            character_id = f"char_{character_name.lower().replace(' ', '_')}"
+            character_id = _char_id(character_name)
 
-            results = self.chroma_client.query_collection(
-                "character", where={"character_id": character_id}, n_results=1
-            )
+            character_data = self._load(character_id)
 
-            if results["documents"] and len(results["documents"][0]) > 0:
-                character_data = json.loads(results["documents"][0][0])
+            if character_data:
+                cached = self._info_cache.get(character_id)
+                if cached and cached[0] == character_data["last_updated"]:
+                    return cached[1]
 
                 # Format character info for display
                 info = f"📋 **{character_data['name']}**\n"
@@ -188,6 +302,7 @@ class CharacterManager:
                 if "inventory" in character_data and character_data["inventory"]:
                     info += f"**Inventory:** {character_data['inventory']}\n"
 
+                self._info_cache[character_id] = (character_data["last_updated"], info)
                 return info
             else:
                 return f"❌ Character '{character_name}' not found"
@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 """Dice rolling functionality for D&D gameplay."""
 
-import random
 from typing import Dict, Any
 
+import numpy as np
+
 from ..config.settings import GameConfig
 
 
@@ -17,6 +18,9 @@ class DiceRoller:
             config: Game configuration
         """
         self.config = config
+        self._rng = np.random.default_rng()
+        self._valid_dice_set = frozenset(config.valid_dice_types)
+        self._valid_dice_str = ", ".join(f"d{d}" for d in config.valid_dice_types)
 
     def roll_dice(
         self, number_of_dice: int, dice_type: int, modification_int: int = 0
@@ -32,10 +36,10 @@ class DiceRoller:
             Dictionary containing roll result and metadata
         """
         # Validate inputs
-        if dice_type not in self.config.valid_dice_types:
+        if dice_type not in self._valid_dice_set:
             return {
                 "success": False,
-                "message": f"❌ Invalid dice type: d{dice_type}. Valid types: {', '.join(f'd{d}' for d in self.config.valid_dice_types)}",
+                "message": f"❌ Invalid dice type: d{dice_type}. Valid types: {self._valid_dice_str}",
                 "total": 0,
                 "rolls": [],
                 "modifier": modification_int,
@@ -51,23 +55,22 @@ class DiceRoller:
             }
 
         # Roll the dice
-        rolls = [random.randint(1, dice_type) for _ in range(number_of_dice)]
-        total = sum(rolls) + modification_int
+        if number_of_dice == 1:
+            # Most rolls are a single die; a scalar draw skips array overhead
+            rolls = [int(self._rng.integers(1, dice_type + 1))]
+            total = rolls[0] + modification_int
+        else:
+            # Draw all dice in one call; tolist() gives back plain Python ints
+            rolls_arr = self._rng.integers(1, dice_type + 1, size=number_of_dice)
+            rolls = rolls_arr.tolist()
+            total = int(rolls_arr.sum()) + modification_int
 
         # Format the result message
+        mod_str = f"{modification_int:+d}" if modification_int else ""
+        expression = f"{number_of_dice}d{dice_type}{mod_str}"
         rolls_str = ", ".join(map(str, rolls))
-        if number_of_dice == 1:
-            if modification_int != 0:
-                message = f"🎲 Rolling 1d{dice_type}{modification_int:+d}: [{rolls[0]}] {modification_int:+d} = {total}"
-            else:
-                message = f"🎲 Rolling 1d{dice_type}: [{rolls[0]}] = {total}"
-        else:
-            if modification_int != 0:
-                message = f"🎲 Rolling {number_of_dice}d{dice_type}{modification_int:+d}: [{rolls_str}] {modification_int:+d} = {total}"
-            else:
-                message = (
-                    f"🎲 Rolling {number_of_dice}d{dice_type}: [{rolls_str}] = {total}"
-                )
+        mod_part = f" {mod_str}" if mod_str else ""
+        message = f"🎲 Rolling {expression}: [{rolls_str}]{mod_part} = {total}"
 
         return {
             "success": True,
@@ -75,9 +78,5 @@ class DiceRoller:
             "total": total,
             "rolls": rolls,
             "modifier": modification_int,
-            "expression": (
-                f"{number_of_dice}d{dice_type}{modification_int:+d}"
-                if modification_int != 0
-                else f"{number_of_dice}d{dice_type}"
-            ),
+            "expression": expression,
         }
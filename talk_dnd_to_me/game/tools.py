@@ -1,13 +1,107 @@
 # -*- coding: utf-8 -*-
 """Game tool definitions and handlers for OpenAI function calling."""
 
-import json
-from typing import List, Dict, Any
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+import orjson
 
 from .dice import DiceRoller
 from .character_manager import CharacterManager
 from ..core.session_manager import SessionManager
 
+# Most distinct argument strings parsed once per batch of tool calls
+_PARSED_ARGS_CACHE_SIZE = 64
+
+# The tool schema is static, so it is built once and shared by every request.
+# Callers must treat it as read-only.
+_TOOL_DEFINITIONS: Tuple[Dict[str, Any], ...] = (
+    {
+        "type": "function",
+        "function": {
+            "name": "roll_dice",
+            "description": "Roll dice for D&D gameplay. Use this when players need to make ability checks, attack rolls, damage rolls, or any other dice-based mechanics.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "number_of_dice": {
+                        "type": "integer",
+                        "description": "Number of dice to roll (1-20)",
+                    },
+                    "dice_type": {
+                        "type": "integer",
+                        "description": "Type of dice (4, 6, 8, 10, 12, 20, 100)",
+                        "enum": [4, 6, 8, 10, 12, 20, 100],
+                    },
+                    "modification_int": {
+                        "type": "integer",
+                        "description": "Modifier to add or subtract from the roll (default 0)",
+                        "default": 0,
+                    },
+                },
+                "required": ["number_of_dice", "dice_type"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "update_character",
+            "description": "Update character stats, inventory, status, or other information",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "character_name": {
+                        "type": "string",
+                        "description": "Name of the character to update",
+                    },
+                    "update_type": {
+                        "type": "string",
+                        "description": "Type of update to perform",
+                        "enum": [
+                            "hp",
+                            "inventory",
+                            "status",
+                            "relationship",
+                            "location",
+                        ],
+                    },
+                    "update_data": {
+                        "type": "object",
+                        "description": "Data to update (structure depends on update_type)",
+                    },
+                },
+                "required": ["character_name", "update_type", "update_data"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_character_info",
+            "description": "Retrieve current information about a character or NPC",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "character_name": {
+                        "type": "string",
+                        "description": "Name of the character to look up",
+                    }
+                },
+                "required": ["character_name"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "end_session",
+            "description": "End the current D&D session and create a summary",
+            "parameters": {"type": "object", "properties": {}},
+        },
+    },
+)
+
 
 class GameToolHandler:
     """Handles game tool execution for OpenAI function calling."""
@@ -29,98 +123,25 @@ class GameToolHandler:
         self.character_manager = character_manager
         self.session_manager = session_manager
 
-    def get_tool_definitions(self) -> List[Dict[str, Any]]:
+        # Session log entries produced while handling one batch of tool calls,
+        # written together once the batch is done
+        self._log_queue: Deque[Dict[str, Any]] = deque()
+
+        # Tool name -> handler taking the parsed arguments
+        self._dispatch: Dict[str, Callable[[Dict[str, Any]], str]] = {
+            "roll_dice": self._handle_roll,
+            "update_character": self._handle_update,
+            "get_character_info": self._handle_info,
+            "end_session": self._handle_end,
+        }
+
+    def get_tool_definitions(self) -> Tuple[Dict[str, Any], ...]:
         """Get OpenAI tool definitions.
 
         Returns:
-            List of tool definitions for OpenAI
+            Shared, read-only tool definitions for OpenAI
         """
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "roll_dice",
-                    "description": "Roll dice for D&D gameplay. Use this when players need to make ability checks, attack rolls, damage rolls, or any other dice-based mechanics.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "number_of_dice": {
-                                "type": "integer",
-                                "description": "Number of dice to roll (1-20)",
-                            },
-                            "dice_type": {
-                                "type": "integer",
-                                "description": "Type of dice (4, 6, 8, 10, 12, 20, 100)",
-                                "enum": [4, 6, 8, 10, 12, 20, 100],
-                            },
-                            "modification_int": {
-                                "type": "integer",
-                                "description": "Modifier to add or subtract from the roll (default 0)",
-                                "default": 0,
-                            },
-                        },
-                        "required": ["number_of_dice", "dice_type"],
-                    },
-                },
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "update_character",
-                    "description": "Update character stats, inventory, status, or other information",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "character_name": {
-                                "type": "string",
-                                "description": "Name of the character to update",
-                            },
-                            "update_type": {
-                                "type": "string",
-                                "description": "Type of update to perform",
-                                "enum": [
-                                    "hp",
-                                    "inventory",
-                                    "status",
-                                    "relationship",
-                                    "location",
-                                ],
-                            },
-                            "update_data": {
-                                "type": "object",
-                                "description": "Data to update (structure depends on update_type)",
-                            },
-                        },
-                        "required": ["character_name", "update_type", "update_data"],
-                    },
-                },
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_character_info",
-                    "description": "Retrieve current information about a character or NPC",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "character_name": {
-                                "type": "string",
-                                "description": "Name of the character to look up",
-                            }
-                        },
-                        "required": ["character_name"],
-                    },
-                },
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "end_session",
-                    "description": "End the current D&D session and create a summary",
-                    "parameters": {"type": "object", "properties": {}},
-                },
-            },
-        ]
+        return _TOOL_DEFINITIONS
 
     def handle_tool_calls(self, tool_calls) -> List[Dict[str, Any]]:
         """Execute tool calls and return results.
@@ -132,59 +153,117 @@ class GameToolHandler:
             List of tool call results
         """
         results = []
+        # Identical calls in one response (e.g. the same roll twice) are
+        # parsed once. Each handler gets its own copy of the top-level
+        # arguments; nested values are shared and must not be mutated.
+        parsed_cache: Dict[str, Dict[str, Any]] = {}
 
-        for tool_call in tool_calls:
-            function_name = tool_call.function.name
-            arguments = json.loads(tool_call.function.arguments)
-
-            try:
-                if function_name == "roll_dice":
-                    roll_result = self.dice_roller.roll_dice(
-                        arguments.get("number_of_dice"),
-                        arguments.get("dice_type"),
-                        arguments.get("modification_int", 0),
-                    )
-
-                    # Log the roll to session history
-                    if roll_result["success"]:
-                        self.session_manager.log_to_session(
-                            {
-                                "entry_type": "dice_roll",
-                                "content": roll_result["message"],
-                                "dice_data": {
-                                    "expression": roll_result["expression"],
-                                    "rolls": roll_result["rolls"],
-                                    "modifier": roll_result["modifier"],
-                                    "total": roll_result["total"],
-                                },
-                            }
-                        )
-
-                    result = roll_result["message"]
-
-                elif function_name == "update_character":
-                    result = self.character_manager.update_character(
-                        arguments.get("character_name"),
-                        arguments.get("update_type"),
-                        arguments.get("update_data"),
-                    )
-
-                elif function_name == "get_character_info":
-                    result = self.character_manager.get_character_info(
-                        arguments.get("character_name")
-                    )
-
-                elif function_name == "end_session":
-                    result = self.session_manager.end_session()
-
-                else:
-                    result = f"❌ Unknown function: {function_name}"
-
-            except Exception as e:
-                result = f"❌ Error executing {function_name}: {e}"
-
-            results.append(
-                {"tool_call_id": tool_call.id, "role": "tool", "content": result}
-            )
+        try:
+            for tool_call in tool_calls:
+                function_name = tool_call.function.name
+                args_raw = tool_call.function.arguments
+                arguments = parsed_cache.get(args_raw)
+                if arguments is None:
+                    arguments = orjson.loads(args_raw)
+                    if len(parsed_cache) < _PARSED_ARGS_CACHE_SIZE:
+                        parsed_cache[args_raw] = arguments
+
+                try:
+                    handler = self._dispatch.get(function_name)
+                    if handler:
+                        result = handler(dict(arguments))
+                    else:
+                        result = f"❌ Unknown function: {function_name}"
+
+                except Exception as e:
+                    result = f"❌ Error executing {function_name}: {e}"
+
+                results.append(
+                    {"tool_call_id": tool_call.id, "role": "tool", "content": result}
+                )
+
+        finally:
+            self._flush_log_queue()
 
         return results
+
+    def _flush_log_queue(self):
+        """Write queued session log entries in a single batch."""
+        if self._log_queue:
+            entries = list(self._log_queue)
+            self._log_queue.clear()
+            self.session_manager.log_batch(entries)
+
+    def _handle_roll(self, arguments: Dict[str, Any]) -> str:
+        """Roll dice and log successful rolls to the session.
+
+        Args:
+            arguments: Parsed roll_dice arguments
+
+        Returns:
+            Roll result message
+        """
+        roll_result = self.dice_roller.roll_dice(
+            arguments.get("number_of_dice"),
+            arguments.get("dice_type"),
+            arguments.get("modification_int", 0),
+        )
+
+        # Queue the roll for the session history
+        if roll_result["success"]:
+            self._log_queue.append(
+                {
+                    "entry_type": "dice_roll",
+                    "content": roll_result["message"],
+                    "dice_data": {
+                        "expression": roll_result["expression"],
+                        "rolls": roll_result["rolls"],
+                        "modifier": roll_result["modifier"],
+                        "total": roll_result["total"],
+                    },
+                }
+            )
+
+        return roll_result["message"]
+
+    def _handle_update(self, arguments: Dict[str, Any]) -> str:
+        """Update a character.
+
+        Args:
+            arguments: Parsed update_character arguments
+
+        Returns:
+            Update result message
+        """
+        return self.character_manager.update_character(
+            arguments.get("character_name"),
+            arguments.get("update_type"),
+            arguments.get("update_data"),
+        )
+
+    def _handle_info(self, arguments: Dict[str, Any]) -> str:
+        """Look up a character.
+
+        Args:
+            arguments: Parsed get_character_info arguments
+
+        Returns:
+            Formatted character information
+        """
+        return self.character_manager.get_character_info(
+            arguments.get("character_name")
+        )
+
+    def _handle_end(self, arguments: Dict[str, Any]) -> str:
+        """End the current session.
+
+        Args:
+            arguments: Parsed end_session arguments (unused)
+
+        Returns:
+            Session end message
+        """
+        # Rolls and character changes from this session are saved before it ends
+        self._flush_log_queue()
+        self.character_manager.flush()
+        return self.session_manager.end_session()
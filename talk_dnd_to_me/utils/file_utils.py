@@ -3,57 +3,124 @@
 
 import hashlib
 import os
-from typing import Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+# Read size for file hashing
+_HASH_CHUNK_SIZE = 1 << 20
 
 
 def get_file_hash(file_path: str) -> Optional[str]:
-    """Calculate SHA256 hash of a file.
+    """Calculate the SHA256 hash of a file, read in 1 MiB chunks.
 
     Args:
         file_path: Path to the file to hash
 
     Returns:
-        SHA256 hash string or None if error
+        Hash string or None if error
     """
-    hash_sha256 = hashlib.sha256()
     try:
+        hash_sha256 = hashlib.sha256()
+        # One buffer per call, reused for every chunk of the file
+        buffer = memoryview(bytearray(_HASH_CHUNK_SIZE))
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
+            while n := f.readinto(buffer):
+                hash_sha256.update(buffer[:n])
         return hash_sha256.hexdigest()
     except Exception as e:
         print(f"Error hashing file {file_path}: {e}")
         return None
 
 
-def get_md5_hash(text: str) -> str:
-    """Calculate MD5 hash of text.
+def hash_files_batched(file_paths: List[str]) -> Dict[str, str]:
+    """Hash many files concurrently.
+
+    hashlib releases the GIL while hashing, so a thread pool overlaps file
+    reads and hashing across files.
+
+    Args:
+        file_paths: Paths of the files to hash
+
+    Returns:
+        Mapping of file path to hash for every file that could be read
+    """
+    if not file_paths:
+        return {}
+
+    max_workers = min(32, (os.cpu_count() or 1) * 4, len(file_paths))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        hashes = executor.map(get_file_hash, file_paths)
+        return {
+            file_path: file_hash
+            for file_path, file_hash in zip(file_paths, hashes)
+            if file_hash
+        }
+
+
+def get_text_key(text: str) -> str:
+    """Calculate a short, non-cryptographic key for a piece of text.
+
+    Used only to derive collection IDs, so it must stay stable: changing
+    the algorithm would orphan every stored chunk and cache entry.
 
     Args:
         text: Text to hash
 
     Returns:
-        MD5 hash string
+        MD5 hex digest of the text
     """
-    return hashlib.md5(text.encode()).hexdigest()
+    return hashlib.md5(text.encode(), usedforsecurity=False).hexdigest()
+
+
+def _scan_directory(path: str) -> Tuple[List[str], List[str]]:
+    """List markdown files and subdirectories of a single directory.
+
+    Args:
+        path: Directory to scan
+
+    Returns:
+        Tuple of markdown file paths and subdirectory paths
+    """
+    md_files = []
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(".md") and entry.is_file():
+                    md_files.append(entry.path)
+    except OSError as e:
+        print(f"Error scanning directory {path}: {e}")
+    return md_files, subdirs
 
 
 def find_markdown_files(base_path: str) -> list[str]:
     """Find all markdown files recursively in a directory.
 
+    Directories are scanned concurrently so their listing latency overlaps.
+
     Args:
         base_path: Base directory to search
 
     Returns:
-        List of markdown file paths
+        Sorted list of markdown file paths
     """
-    md_files = []
-    if not os.path.exists(base_path):
-        return md_files
+    if not os.path.isdir(base_path):
+        return []
 
-    for root, dirs, files in os.walk(base_path):
-        for file in files:
-            if file.endswith(".md"):
-                md_files.append(os.path.join(root, file))
+    md_files = []
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_scan_directory, base_path)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                md_files.extend(files)
+                pending.update(
+                    executor.submit(_scan_directory, subdir) for subdir in subdirs
+                )
 
+    md_files.sort()
     return md_files
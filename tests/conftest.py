@@ -3,8 +3,12 @@
 Pytest configuration and shared fixtures.
 """
 
+import functools
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -12,6 +16,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import pytest  # noqa: E402
 import requests  # noqa: E402
 from typing import Generator  # noqa: E402
+from unittest.mock import MagicMock  # noqa: E402
 
 from talk_dnd_to_me.config.settings import DMConfig  # noqa: E402
 from talk_dnd_to_me.core.dm_engine import DMEngine  # noqa: E402
@@ -19,6 +24,7 @@ from talk_dnd_to_me.database.chroma_client import ChromaClient  # noqa: E402
 from talk_dnd_to_me.database.cache_manager import CacheManager  # noqa: E402
 from talk_dnd_to_me.content.embeddings import EmbeddingManager  # noqa: E402
 from talk_dnd_to_me.ai.context_retriever import ContextRetriever  # noqa: E402
+from talk_dnd_to_me.core.world_state_manager import WorldStateManager  # noqa: E402
 
 
 @pytest.fixture(scope="session")
@@ -33,7 +39,22 @@ def chroma_client(dm_config: DMConfig) -> Generator[ChromaClient, None, None]:
     client = ChromaClient(dm_config.database)
     if not client.initialize():
         pytest.fail("Failed to initialize ChromaDB client")
+
+    # Handles are resolved by initialize(); touch each collection once so the
+    # first test using it doesn't pay for loading it from disk. The counts
+    # are independent queries, so they run concurrently.
+    collections = list(client.collections.values())
+    with ThreadPoolExecutor(max_workers=len(collections)) as executor:
+        list(executor.map(lambda collection: collection.count(), collections))
+
     yield client
+    client.close()
+
+
+@pytest.fixture
+def fake_chroma_client() -> MagicMock:
+    """Provide an in-memory stand-in for the ChromaDB client wrapper."""
+    return MagicMock(spec=ChromaClient)
 
 
 @pytest.fixture(scope="session")
@@ -53,26 +74,34 @@ def context_retriever(
     chroma_client: ChromaClient,
     embedding_manager: EmbeddingManager,
     dm_config: DMConfig,
-) -> ContextRetriever:
+) -> Generator[ContextRetriever, None, None]:
     """Provide context retriever."""
-    from talk_dnd_to_me.core.world_state_manager import WorldStateManager
-
     world_state_manager = WorldStateManager(chroma_client, embedding_manager)
-    return ContextRetriever(
+    yield ContextRetriever(
         chroma_client=chroma_client,
         embedding_manager=embedding_manager,
         world_state_manager=world_state_manager,
         config=dm_config.content,
     )
+    world_state_manager.close()
 
 
-@pytest.fixture(scope="function")
-def dm_engine(dm_config: DMConfig) -> Generator[DMEngine, None, None]:
-    """Provide initialized DM engine for each test."""
+@pytest.fixture(scope="session")
+def dm_engine_session(dm_config: DMConfig) -> Generator[DMEngine, None, None]:
+    """Provide a DM engine initialized once for the whole test session."""
     engine = DMEngine(dm_config)
     if not engine.initialize():
         pytest.fail("Failed to initialize DM engine")
     yield engine
+    engine.world_state_manager.close()
+    engine.chroma_client.close()
+
+
+@pytest.fixture
+def dm_engine(dm_engine_session: DMEngine) -> Generator[DMEngine, None, None]:
+    """Provide the shared DM engine, clearing conversation state after each test."""
+    yield dm_engine_session
+    dm_engine_session.reset_conversation()
 
 
 @pytest.fixture(scope="session")
@@ -107,39 +136,65 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "rag: RAG and context tests")
 
 
+# Probe result shared between pytest runs for a short time
+_LLM_CHECK_CACHE = Path.home() / ".cache" / "talk_dnd" / "llm_ok"
+_LLM_CHECK_TTL = 30.0
+
+
+@functools.lru_cache(maxsize=1)
 def check_llm_available():
-    """Check if local LLM is available."""
+    """Check if local LLM is available.
+
+    The result is cached on disk for a few seconds so back-to-back runs
+    don't wait on the HTTP probe.
+    """
+    try:
+        if time.time() - _LLM_CHECK_CACHE.stat().st_mtime < _LLM_CHECK_TTL:
+            return _LLM_CHECK_CACHE.read_text() == "1"
+    except OSError:
+        pass
+
     try:
         response = requests.get("http://localhost:11434/v1/models", timeout=2)
-        return response.status_code == 200
+        available = response.status_code == 200
     except Exception:
-        return False
+        available = False
+
+    try:
+        _LLM_CHECK_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        _LLM_CHECK_CACHE.write_text("1" if available else "0")
+    except OSError:
+        pass
+
+    return available
+
+
+# Markers applied when any of the substrings appears in a test's node ID
+_NODEID_MARKERS = (
+    (("integration",), pytest.mark.integration),
+    (("caching", "cache"), pytest.mark.caching),
+    (("rag", "context"), pytest.mark.rag),
+)
 
 
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers automatically."""
-    llm_available = check_llm_available()
+    # Skip LLM tests if no LLM is available
+    llm_skip = (
+        None
+        if check_llm_available()
+        else pytest.mark.skip(reason="Local LLM not available at localhost:11434")
+    )
 
     for item in items:
+        nodeid = item.nodeid
+
         # Mark tests that require LLM
-        if "llm" in item.nodeid or "dm_engine" in str(item.fixturenames):
+        if "llm" in nodeid or "dm_engine" in item.fixturenames:
             item.add_marker(pytest.mark.llm)
-            # Skip LLM tests if no LLM is available
-            if not llm_available:
-                item.add_marker(
-                    pytest.mark.skip(
-                        reason="Local LLM not available at localhost:11434"
-                    )
-                )
-
-        # Mark integration tests
-        if "integration" in item.nodeid:
-            item.add_marker(pytest.mark.integration)
-
-        # Mark caching tests
-        if "caching" in item.nodeid or "cache" in item.nodeid:
-            item.add_marker(pytest.mark.caching)
-
-        # Mark RAG tests
-        if "rag" in item.nodeid or "context" in item.nodeid:
-            item.add_marker(pytest.mark.rag)
+            if llm_skip:
+                item.add_marker(llm_skip)
+
+        for substrings, marker in _NODEID_MARKERS:
+            if any(s in nodeid for s in substrings):
+                item.add_marker(marker)
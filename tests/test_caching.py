@@ -43,6 +43,18 @@ class TestCacheManager:
             cached_chunks == test_chunk_ids
         ), f"Cached chunks don't match: expected {test_chunk_ids}, got {cached_chunks}"
 
+    def test_bulk_cache_lookup(self, cache_manager: CacheManager):
+        """Test looking up many cache entries in one call."""
+        cache_manager.update_file_cache("bulk_a.md", "hash_a", ["chunk_a"], {})
+        cache_manager.update_file_cache("bulk_b.md", "hash_b", ["chunk_b"], {})
+
+        paths = ["bulk_a.md", "bulk_b.md", "bulk_missing.md"]
+        cached_hashes = cache_manager.check_file_cache_bulk(paths)
+        cached_chunks = cache_manager.get_cached_chunks_bulk(paths)
+
+        assert cached_hashes == {"bulk_a.md": "hash_a", "bulk_b.md": "hash_b"}
+        assert cached_chunks == {"bulk_a.md": ["chunk_a"], "bulk_b.md": ["chunk_b"]}
+
     @pytest.mark.slow
     def test_cache_performance_improvement(
         self, cache_manager: CacheManager, embedding_manager, dm_config
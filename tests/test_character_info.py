@@ -7,6 +7,24 @@ import pytest
 import re
 from talk_dnd_to_me.core.dm_engine import DMEngine
 
+# Whole numbers, e.g. ability scores
+_STAT_RE = re.compile(r"\b\d+\b")
+
+# Lowercase words that indicate a response mentions character details
+_CHARACTER_KEYWORDS = frozenset(
+    (
+        "elf",
+        "bard",
+        "charisma",
+        "level",
+        "stats",
+        "character",
+        "rose",
+        "ability",
+        "score",
+    )
+)
+
 
 @pytest.mark.llm
 class TestCharacterInfo:
@@ -23,30 +41,18 @@ class TestCharacterInfo:
 
     def test_character_details_retrieval(self, dm_engine: DMEngine):
         """Test that character details are included in responses."""
-        queries = [
+        queries = (
             "What are my character's stats?",
             "Tell me about my character's abilities",
             "Who am I playing as?",
-        ]
+        )
 
         for query in queries:
             response = dm_engine.generate_response(query)
 
             # Check for character details - be more flexible with keywords
-            character_keywords = [
-                "elf",
-                "bard",
-                "charisma",
-                "level",
-                "stats",
-                "character",
-                "rose",
-                "ability",
-                "score",
-            ]
-            found_keywords = [
-                kw for kw in character_keywords if kw.lower() in response.lower()
-            ]
+            response_lower = response.lower()
+            found_keywords = [kw for kw in _CHARACTER_KEYWORDS if kw in response_lower]
 
             assert (
                 found_keywords
@@ -58,7 +64,7 @@ class TestCharacterInfo:
         response = dm_engine.generate_response(query)
 
         # Look for numbers that could be ability scores (typically 8-20)
-        numbers = re.findall(r"\b\d+\b", response)
+        numbers = _STAT_RE.findall(response)
         stat_numbers = [int(n) for n in numbers if 6 <= int(n) <= 20]
 
         assert stat_numbers, f"No ability score numbers found in: {response[:200]}..."
@@ -77,9 +83,10 @@ class TestCharacterInfo:
 
         # Should get a meaningful response (not empty or error) - relaxed length requirement
         assert len(response) > 10, f"Response too short for query '{query}': {response}"
+        response_lower = response.lower()
         assert (
-            "error" not in response.lower()
+            "error" not in response_lower
         ), f"Error in response to '{query}': {response}"
         assert (
-            "trouble generating" not in response.lower()
+            "trouble generating" not in response_lower
         ), f"LLM error in response to '{query}': {response}"
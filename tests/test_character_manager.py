@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Test character manager caching and batched saves.
+"""
+
+import pytest
+import json
+from concurrent.futures import Future
+from talk_dnd_to_me.game.character_manager import (
+    _FLUSH_EVERY_UPDATES,
+    CharacterManager,
+)
+
+# Stored character document for Rose
+ROSE_ID = "char_rose"
+ROSE_DATA = {
+    "character_id": ROSE_ID,
+    "name": "Rose",
+    "character_type": "player",
+    "last_updated": "2024-05-01T12:00:00",
+    "session_last_seen": None,
+    "attributes": {"hit_points": {"current": 22, "maximum": 22}},
+    "inventory": {},
+    "personality": {},
+    "relationships": {},
+    "campaign_data": {"current_location": "Emerald Grove"},
+    "change_log": [],
+}
+ROSE_DOCUMENT = json.dumps(ROSE_DATA)
+
+
+def _get_documents(collection_type, ids):
+    """Serve Rose from the fake character collection; anyone else is missing."""
+    if ids == [ROSE_ID]:
+        return {"ids": [ROSE_ID], "documents": [ROSE_DOCUMENT]}
+    return {"ids": [], "documents": []}
+
+
+@pytest.fixture
+def character_manager(fake_chroma_client) -> CharacterManager:
+    """Provide a character manager backed by the fake ChromaDB client."""
+    fake_chroma_client.get_documents.side_effect = _get_documents
+    return CharacterManager(fake_chroma_client)
+
+
+@pytest.mark.unit
+class TestCharacterManager:
+    """Test in-memory character updates and their batched saves."""
+
+    def test_flush_saves_updates_in_one_upsert(
+        self, character_manager, fake_chroma_client
+    ):
+        """Updates to several characters are saved by a single upsert."""
+        character_manager.update_character("Rose", "hp", {"current": 15})
+        character_manager.update_character("Lae'zel", "location", {"location": "Camp"})
+        character_manager.update_character("Rose", "inventory", {"potion": 2})
+        fake_chroma_client.upsert_documents.assert_not_called()
+
+        character_manager.flush()
+
+        fake_chroma_client.upsert_documents.assert_called_once()
+        call = fake_chroma_client.upsert_documents.call_args
+        assert call.args[0] == "character_data"
+        assert sorted(call.kwargs["ids"]) == sorted([ROSE_ID, "char_lae'zel"])
+        saved = {
+            character["character_id"]: character
+            for character in map(json.loads, call.kwargs["documents"])
+        }
+        assert saved[ROSE_ID]["attributes"]["hit_points"]["current"] == 15
+        assert saved[ROSE_ID]["inventory"] == {"potion": 2}
+
+        # Nothing is left to save
+        character_manager.flush()
+        fake_chroma_client.upsert_documents.assert_called_once()
+
+    def test_repeated_updates_flush_automatically(
+        self, character_manager, fake_chroma_client
+    ):
+        """Updates to one character are saved once enough of them pile up."""
+        for hp in range(1, _FLUSH_EVERY_UPDATES):
+            character_manager.update_character("Rose", "hp", {"current": hp})
+        fake_chroma_client.upsert_documents.assert_not_called()
+
+        character_manager.update_character("Rose", "hp", {"current": 0})
+
+        fake_chroma_client.upsert_documents.assert_called_once()
+        assert fake_chroma_client.upsert_documents.call_args.kwargs["ids"] == [ROSE_ID]
+
+    def test_reads_see_unflushed_updates(self, character_manager, fake_chroma_client):
+        """Character info reflects updates that have not been saved yet."""
+        character_manager.update_character("Rose", "hp", {"current": 9})
+
+        info = character_manager.get_character_info("Rose")
+
+        assert "HP: 9/22" in info
+        fake_chroma_client.upsert_documents.assert_not_called()
+        # The character is read from the database only once
+        fake_chroma_client.get_documents.assert_called_once()
+
+    def test_unchanged_update_skips_write(self, character_manager, fake_chroma_client):
+        """An update matching the stored values is neither logged nor saved."""
+        result = character_manager.update_character(
+            "Rose", "location", {"location": "Emerald Grove"}
+        )
+
+        assert result == "✓ Rose: no change"
+        character_manager.flush()
+        fake_chroma_client.upsert_documents.assert_not_called()
+
+    def test_info_cache_invalidated_after_update(self, character_manager):
+        """Cached character info is rebuilt after the character changes."""
+        assert "HP: 22/22" in character_manager.get_character_info("Rose")
+
+        character_manager.update_character("Rose", "hp", {"current": 12})
+
+        info = character_manager.get_character_info("Rose")
+        assert "HP: 12/22" in info
+        assert "HP: 22/22" not in info
+
+    def test_failed_flush_retries_updates(self, character_manager, fake_chroma_client):
+        """Characters stay pending when the save fails, so the next flush retries."""
+        failed = Future()
+        failed.set_exception(RuntimeError("database is locked"))
+        succeeded = Future()
+        succeeded.set_result(None)
+        fake_chroma_client.upsert_documents.side_effect = [failed, succeeded]
+
+        character_manager.update_character("Rose", "hp", {"current": 5})
+        character_manager.flush()
+        character_manager.flush()
+
+        assert fake_chroma_client.upsert_documents.call_count == 2
+        retry = fake_chroma_client.upsert_documents.call_args
+        assert retry.kwargs["ids"] == [ROSE_ID]
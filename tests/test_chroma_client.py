@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Test the ChromaDB client's background write queue.
+"""
+
+import pytest
+import threading
+from unittest.mock import MagicMock
+from talk_dnd_to_me.config.settings import DMConfig
+from talk_dnd_to_me.database.chroma_client import ChromaClient
+
+# Seconds to wait for the writer thread before failing a test
+WRITE_TIMEOUT = 5.0
+
+
+@pytest.fixture
+def queued_client():
+    """Provide a client whose collections are mocks, without a database."""
+    client = ChromaClient(DMConfig.default().database)
+    client.collections = {
+        collection_type: MagicMock() for collection_type in client._type_to_name
+    }
+    yield client
+    client.close()
+
+
+def _add(client, collection_type):
+    """Queue a one-document add to a collection."""
+    return client.add_documents(
+        collection_type, documents=["text"], metadatas=[{}], ids=["doc_1"]
+    )
+
+
+@pytest.mark.unit
+class TestChromaClientWrites:
+    """Test ordering, error reporting and shutdown of queued writes."""
+
+    def test_failed_write_reported_through_future(self, queued_client, capsys):
+        """A failed write raises from its Future and prints nothing itself."""
+        error = RuntimeError("database is locked")
+        queued_client.collections["file_cache"].add.side_effect = error
+
+        future = _add(queued_client, "file_cache")
+
+        assert future.exception(timeout=WRITE_TIMEOUT) is error
+        assert capsys.readouterr().out == ""
+
+    def test_read_waits_only_for_its_collection(self, queued_client):
+        """A read is not held up by a slow write to another collection."""
+        release = threading.Event()
+        queued_client.collections["current_session"].add.side_effect = (
+            lambda **kwargs: release.wait(WRITE_TIMEOUT)
+        )
+        blocked = _add(queued_client, "current_session")
+
+        try:
+            collection = queued_client.get_collection("character_data")
+            assert collection is queued_client.collections["character_data"]
+            assert not blocked.done()
+        finally:
+            release.set()
+
+        # A read of the written collection waits for the write
+        queued_client.get_collection("current_session")
+        assert blocked.done()
+
+    def test_close_applies_queued_writes(self, queued_client):
+        """Writes queued before close() are applied; later writes are refused."""
+        futures = [_add(queued_client, "session_history") for _ in range(3)]
+
+        queued_client.close()
+
+        assert all(future.done() for future in futures)
+        assert queued_client.collections["session_history"].add.call_count == 3
+        with pytest.raises(RuntimeError):
+            _add(queued_client, "session_history")
@@ -5,21 +5,109 @@ Test function calling and tool schemas.
 
 import pytest
 import json
+from types import SimpleNamespace
 from unittest.mock import Mock
 from talk_dnd_to_me.game.tools import GameToolHandler
 from talk_dnd_to_me.game.dice import DiceRoller
 from talk_dnd_to_me.game.character_manager import CharacterManager
 
-
-@pytest.fixture
+# Tool call arguments, serialized once
+ROLL_DICE_ARGS_JSON = json.dumps(
+    {"number_of_dice": 1, "dice_type": 20, "modification_int": 5}
+)
+UPDATE_HP_ARGS_JSON = json.dumps(
+    {
+        "character_name": "Rose",
+        "update_type": "hp",
+        "update_data": {"current_hp": 25, "change": -5},
+    }
+)
+CHARACTER_INFO_ARGS_JSON = json.dumps({"character_name": "Rose"})
+EMPTY_ARGS_JSON = json.dumps({})
+MULTIPLE_CALLS = (
+    ("roll_dice", json.dumps({"number_of_dice": 1, "dice_type": 20})),
+    (
+        "roll_dice",
+        json.dumps({"number_of_dice": 1, "dice_type": 8, "modification_int": 3}),
+    ),
+    (
+        "update_character",
+        json.dumps(
+            {
+                "character_name": "Rose",
+                "update_type": "hp",
+                "update_data": {"change": -8},
+            }
+        ),
+    ),
+)
+
+# Number of roll_dice calls sent in one response by the batching test
+BATCHED_ROLLS = 4
+
+# Canned DiceRoller.roll_dice results; handlers only read them
+DICE_ROLL_RESPONSE = {
+    "success": True,
+    "message": "Rolled 1d20+5: 15 (rolled 10, +5 modifier)",
+    "expression": "1d20+5",
+    "rolls": [10],
+    "modifier": 5,
+    "total": 15,
+}
+PLAIN_ROLL_RESPONSE = {
+    "success": True,
+    "message": "Rolled dice",
+    "expression": "1d20",
+    "rolls": [15],
+    "modifier": 0,
+    "total": 15,
+}
+
+
+def make_tool_call(
+    name: str, arguments: str, call_id: str = "test_id"
+) -> SimpleNamespace:
+    """Build a stand-in for an OpenAI tool call with JSON arguments."""
+    return SimpleNamespace(
+        id=call_id, function=SimpleNamespace(name=name, arguments=arguments)
+    )
+
+
+@pytest.fixture(scope="module")
 def game_tool_handler():
-    """Create a GameToolHandler for testing."""
+    """Create a GameToolHandler for testing, shared by the module."""
     dice_roller = Mock(spec=DiceRoller)
     character_manager = Mock(spec=CharacterManager)
     session_manager = Mock()
     return GameToolHandler(dice_roller, character_manager, session_manager)
 
 
+@pytest.fixture(autouse=True)
+def reset_mocks(game_tool_handler):
+    """Reset the shared handler's mocks after each test.
+
+    Return values and side effects are cleared too, so no test depends on
+    another having run first and the module is safe to split across
+    pytest-xdist workers.
+    """
+    yield
+    for mock in (
+        game_tool_handler.dice_roller,
+        game_tool_handler.character_manager,
+        game_tool_handler.session_manager,
+    ):
+        mock.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture(scope="class")
+def tools_by_name(game_tool_handler):
+    """Index the tool definitions by function name."""
+    return {
+        tool["function"]["name"]: tool
+        for tool in game_tool_handler.get_tool_definitions()
+    }
+
+
 @pytest.mark.unit
 class TestToolSchemas:
     """Test tool schema definitions."""
@@ -44,24 +132,18 @@ class TestToolSchemas:
             assert "description" in func, f"Function missing 'description': {func}"
             assert "parameters" in func, f"Function missing 'parameters': {func}"
 
-    def test_required_tools_exist(self, game_tool_handler):
+    def test_required_tools_exist(self, tools_by_name):
         """Test that required tools are defined."""
-        tools = game_tool_handler.get_tool_definitions()
-        tool_names = [tool["function"]["name"] for tool in tools]
-
-        required_tools = ["roll_dice", "update_character", "get_character_info"]
+        required_tools = ("roll_dice", "update_character", "get_character_info")
 
         for required_tool in required_tools:
             assert (
-                required_tool in tool_names
+                required_tool in tools_by_name
             ), f"Required tool '{required_tool}' not found"
 
-    def test_roll_dice_schema(self, game_tool_handler):
+    def test_roll_dice_schema(self, tools_by_name):
         """Test roll_dice tool schema specifics."""
-        tools = game_tool_handler.get_tool_definitions()
-        roll_dice_tool = next(
-            tool for tool in tools if tool["function"]["name"] == "roll_dice"
-        )
+        roll_dice_tool = tools_by_name["roll_dice"]
 
         assert roll_dice_tool["function"]["name"] == "roll_dice"
 
@@ -70,12 +152,9 @@ class TestToolSchemas:
         assert "number_of_dice" in params["properties"]
         assert "dice_type" in params["properties"]
 
-    def test_update_character_schema(self, game_tool_handler):
+    def test_update_character_schema(self, tools_by_name):
         """Test update_character tool schema."""
-        tools = game_tool_handler.get_tool_definitions()
-        update_tool = next(
-            tool for tool in tools if tool["function"]["name"] == "update_character"
-        )
+        update_tool = tools_by_name["update_character"]
 
         assert update_tool["function"]["name"] == "update_character"
 
@@ -84,12 +163,9 @@ class TestToolSchemas:
         assert "character_name" in params["properties"]
         assert "update_type" in params["properties"]
 
-    def test_get_character_info_schema(self, game_tool_handler):
+    def test_get_character_info_schema(self, tools_by_name):
         """Test get_character_info tool schema."""
-        tools = game_tool_handler.get_tool_definitions()
-        info_tool = next(
-            tool for tool in tools if tool["function"]["name"] == "get_character_info"
-        )
+        info_tool = tools_by_name["get_character_info"]
 
         assert info_tool["function"]["name"] == "get_character_info"
 
@@ -105,22 +181,10 @@ class TestFunctionCalling:
     def test_dice_roller_integration(self, game_tool_handler):
         """Test that dice roller is called correctly."""
         # Mock the dice roller response
-        game_tool_handler.dice_roller.roll_dice.return_value = {
-            "success": True,
-            "message": "Rolled 1d20+5: 15 (rolled 10, +5 modifier)",
-            "expression": "1d20+5",
-            "rolls": [10],
-            "modifier": 5,
-            "total": 15,
-        }
+        game_tool_handler.dice_roller.roll_dice.return_value = DICE_ROLL_RESPONSE
 
         # Create mock tool call
-        mock_tool_call = Mock()
-        mock_tool_call.function.name = "roll_dice"
-        mock_tool_call.function.arguments = json.dumps(
-            {"number_of_dice": 1, "dice_type": 20, "modification_int": 5}
-        )
-        mock_tool_call.id = "test_id"
+        mock_tool_call = make_tool_call("roll_dice", ROLL_DICE_ARGS_JSON)
 
         # Execute tool call
         results = game_tool_handler.handle_tool_calls([mock_tool_call])
@@ -139,16 +203,7 @@ class TestFunctionCalling:
         )
 
         # Create mock tool call
-        mock_tool_call = Mock()
-        mock_tool_call.function.name = "update_character"
-        mock_tool_call.function.arguments = json.dumps(
-            {
-                "character_name": "Rose",
-                "update_type": "hp",
-                "update_data": {"current_hp": 25, "change": -5},
-            }
-        )
-        mock_tool_call.id = "test_id"
+        mock_tool_call = make_tool_call("update_character", UPDATE_HP_ARGS_JSON)
 
         # Execute tool call
         results = game_tool_handler.handle_tool_calls([mock_tool_call])
@@ -165,10 +220,7 @@ class TestFunctionCalling:
         )
 
         # Create mock tool call
-        mock_tool_call = Mock()
-        mock_tool_call.function.name = "get_character_info"
-        mock_tool_call.function.arguments = json.dumps({"character_name": "Rose"})
-        mock_tool_call.id = "test_id"
+        mock_tool_call = make_tool_call("get_character_info", CHARACTER_INFO_ARGS_JSON)
 
         # Execute tool call
         results = game_tool_handler.handle_tool_calls([mock_tool_call])
@@ -180,10 +232,7 @@ class TestFunctionCalling:
     def test_unknown_function_handling(self, game_tool_handler):
         """Test handling of unknown functions."""
         # Create mock tool call with unknown function
-        mock_tool_call = Mock()
-        mock_tool_call.function.name = "unknown_function"
-        mock_tool_call.function.arguments = json.dumps({})
-        mock_tool_call.id = "test_id"
+        mock_tool_call = make_tool_call("unknown_function", EMPTY_ARGS_JSON)
 
         # Execute tool call
         results = game_tool_handler.handle_tool_calls([mock_tool_call])
@@ -192,6 +241,74 @@ class TestFunctionCalling:
         result = results[0]
         assert "Unknown function" in result["content"]
 
+    def test_rolls_logged_in_one_batch(self, game_tool_handler):
+        """Test that rolls in one response are written in a single log batch."""
+        game_tool_handler.dice_roller.roll_dice.return_value = DICE_ROLL_RESPONSE
+        tool_calls = [
+            make_tool_call("roll_dice", ROLL_DICE_ARGS_JSON, f"roll_{i}")
+            for i in range(BATCHED_ROLLS)
+        ]
+
+        game_tool_handler.handle_tool_calls(tool_calls)
+
+        session_manager = game_tool_handler.session_manager
+        session_manager.log_batch.assert_called_once()
+        entries = session_manager.log_batch.call_args.args[0]
+        assert len(entries) == BATCHED_ROLLS
+        assert all(entry["entry_type"] == "dice_roll" for entry in entries)
+        session_manager.log_to_session.assert_not_called()
+
+    def test_identical_calls_get_separate_arguments(self):
+        """Test that a handler changing its arguments doesn't affect a repeat call."""
+        handler = GameToolHandler(
+            Mock(spec=DiceRoller), Mock(spec=CharacterManager), Mock()
+        )
+        dice_types = []
+
+        def take_dice_type(arguments):
+            dice_types.append(arguments.pop("dice_type", None))
+            return "Rolled"
+
+        handler._dispatch["roll_dice"] = take_dice_type
+        handler.handle_tool_calls(
+            [
+                make_tool_call("roll_dice", ROLL_DICE_ARGS_JSON, f"roll_{i}")
+                for i in range(2)
+            ]
+        )
+
+        assert dice_types == [20, 20]
+
+    def test_rolls_logged_before_session_end(self, game_tool_handler):
+        """Test that queued rolls are written before the session is ended."""
+        game_tool_handler.dice_roller.roll_dice.return_value = DICE_ROLL_RESPONSE
+        game_tool_handler.session_manager.end_session.return_value = "Session ended"
+        tool_calls = [
+            make_tool_call("roll_dice", ROLL_DICE_ARGS_JSON, "roll_0"),
+            make_tool_call("roll_dice", ROLL_DICE_ARGS_JSON, "roll_1"),
+            make_tool_call("end_session", EMPTY_ARGS_JSON, "end"),
+        ]
+
+        game_tool_handler.handle_tool_calls(tool_calls)
+
+        session_manager = game_tool_handler.session_manager
+        assert [call[0] for call in session_manager.mock_calls] == [
+            "log_batch",
+            "end_session",
+        ]
+        assert len(session_manager.log_batch.call_args.args[0]) == 2
+
+    def test_character_updates_saved_before_session_end(self, game_tool_handler):
+        """Test that pending character updates are saved when the session ends."""
+        game_tool_handler.session_manager.end_session.return_value = "Session ended"
+
+        game_tool_handler.handle_tool_calls(
+            [make_tool_call("end_session", EMPTY_ARGS_JSON, "end")]
+        )
+
+        game_tool_handler.character_manager.flush.assert_called_once()
+        game_tool_handler.session_manager.end_session.assert_called_once()
+
 
 @pytest.mark.unit
 class TestMockFunctionCalls:
@@ -212,13 +329,7 @@ class TestMockFunctionCalls:
                                 "type": "function",
                                 "function": {
                                     "name": "roll_dice",
-                                    "arguments": json.dumps(
-                                        {
-                                            "number_of_dice": 1,
-                                            "dice_type": 20,
-                                            "modification_int": 5,
-                                        }
-                                    ),
+                                    "arguments": ROLL_DICE_ARGS_JSON,
                                 },
                             }
                         ],
@@ -242,42 +353,16 @@ class TestMockFunctionCalls:
     def test_multiple_function_calls(self, game_tool_handler):
         """Test handling multiple function calls."""
         # Mock responses
-        game_tool_handler.dice_roller.roll_dice.return_value = {
-            "success": True,
-            "message": "Rolled dice",
-            "expression": "1d20",
-            "rolls": [15],
-            "modifier": 0,
-            "total": 15,
-        }
+        game_tool_handler.dice_roller.roll_dice.return_value = PLAIN_ROLL_RESPONSE
         game_tool_handler.character_manager.update_character.return_value = (
             "Character updated"
         )
 
         # Create multiple mock tool calls
-        mock_tool_calls = []
-        for i, (func_name, args) in enumerate(
-            [
-                ("roll_dice", {"number_of_dice": 1, "dice_type": 20}),
-                (
-                    "roll_dice",
-                    {"number_of_dice": 1, "dice_type": 8, "modification_int": 3},
-                ),
-                (
-                    "update_character",
-                    {
-                        "character_name": "Rose",
-                        "update_type": "hp",
-                        "update_data": {"change": -8},
-                    },
-                ),
-            ]
-        ):
-            mock_call = Mock()
-            mock_call.function.name = func_name
-            mock_call.function.arguments = json.dumps(args)
-            mock_call.id = f"test_id_{i}"
-            mock_tool_calls.append(mock_call)
+        mock_tool_calls = [
+            make_tool_call(func_name, arguments, f"test_id_{i}")
+            for i, (func_name, arguments) in enumerate(MULTIPLE_CALLS)
+        ]
 
         # Execute all calls
         results = game_tool_handler.handle_tool_calls(mock_tool_calls)
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+Test world state persistence: delta replay, compaction and snapshot decoding.
+"""
+
+import pytest
+import orjson
+from concurrent.futures import Future
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from talk_dnd_to_me.content.embeddings import EmbeddingManager
+from talk_dnd_to_me.core.world_state_manager import (
+    DELTA_COMPACT_THRESHOLD,
+    WorldState,
+    WorldStateManager,
+    _decode_any,
+    _encode_state,
+)
+
+# ID of the single world state a manager stores
+STATE_ID = "current_world_state"
+
+# Fixed clock reading for timestamp tests
+EVENT_TIME = 1_700_000_000.0
+
+# Snapshot as stored before the positional schema
+LEGACY_SNAPSHOT = {
+    "current_act": "Act II",
+    "current_arc": "Arc D",
+    "current_location": "Baldur's Gate",
+    "active_quests": ["Find the artifact"],
+    "story_flags": {"met_the_emperor": True},
+    "important_events": ["Arrived in the city"],
+    "current_session_number": 4,
+    "last_updated": "2024-05-01T12:00:00",
+}
+
+
+def _get_results(records):
+    """Build a ChromaDB ``get`` result from (metadata, document) pairs."""
+    return {
+        "ids": [f"id_{i}" for i in range(len(records))],
+        "metadatas": [metadata for metadata, _ in records],
+        "documents": [document for _, document in records],
+    }
+
+
+@pytest.fixture
+def world_state_manager(fake_chroma_client):
+    """Provide a world state manager backed by the fake ChromaDB client."""
+    embedding_manager = MagicMock(spec=EmbeddingManager)
+    embedding_manager.embed_query.return_value = [0.0]
+    manager = WorldStateManager(fake_chroma_client, embedding_manager)
+    yield manager
+    manager.close()
+
+
+def _stub_store(fake_chroma_client, snapshot, deltas):
+    """Serve a snapshot and delta log from the fake ChromaDB client."""
+    collections = {
+        "world_state": MagicMock(),
+        "world_state_deltas": MagicMock(),
+    }
+    collections["world_state"].get.return_value = _get_results(snapshot)
+    collections["world_state_deltas"].get.return_value = _get_results(deltas)
+    fake_chroma_client.get_collection.side_effect = collections.__getitem__
+    return collections
+
+
+def _saved_snapshots(fake_chroma_client):
+    """Return the metadata of every snapshot written to the fake client."""
+    return [
+        call.kwargs["metadatas"][0]
+        for call in fake_chroma_client.upsert_documents.call_args_list
+        if call.args[0] == "world_state"
+    ]
+
+
+def _saved_delta_seqs(fake_chroma_client):
+    """Return the sequence numbers of every delta written to the fake client."""
+    return [
+        metadata["seq"]
+        for call in fake_chroma_client.add_documents.call_args_list
+        if call.args[0] == "world_state_deltas"
+        for metadata in call.kwargs["metadatas"]
+    ]
+
+
+@pytest.mark.unit
+class TestWorldStateSnapshots:
+    """Test encoding and decoding of stored world state snapshots."""
+
+    def test_positional_snapshot_round_trip(self):
+        """A snapshot written by the current schema decodes to the same state."""
+        state = WorldState(**LEGACY_SNAPSHOT)
+        decoded = _decode_any(_encode_state(state))
+        assert decoded == state
+
+    def test_legacy_dict_snapshot_decodes(self):
+        """Snapshots stored as a field-name dict are still readable."""
+        decoded = _decode_any(orjson.dumps(LEGACY_SNAPSHOT))
+        assert decoded == WorldState(**LEGACY_SNAPSHOT)
+        assert decoded.current_location == "Baldur's Gate"
+        assert list(decoded.important_events) == ["Arrived in the city"]
+
+    def test_unknown_schema_tag_rejected(self):
+        """A positional snapshot with an unknown version tag is refused."""
+        with pytest.raises(ValueError):
+            _decode_any(orjson.dumps(["v0", "Act I"]))
+
+
+@pytest.mark.unit
+class TestWorldStateDeltas:
+    """Test the delta log that persists world state changes."""
+
+    def test_load_replays_deltas_in_seq_order(
+        self, world_state_manager, fake_chroma_client
+    ):
+        """Deltas after the snapshot are applied in sequence order on load."""
+        snapshot = orjson.dumps(LEGACY_SNAPSHOT).decode()
+        deltas = [
+            (
+                {"seq": 12, "ts": 1_700_000_002.0},
+                orjson.dumps(
+                    {"op": "set", "values": {"current_location": "Wyrm's Rock"}}
+                ).decode(),
+            ),
+            (
+                {"seq": 11, "ts": 1_700_000_001.0},
+                orjson.dumps(
+                    {"op": "set", "values": {"current_location": "Lower City"}}
+                ).decode(),
+            ),
+            (
+                {"seq": 13, "ts": 1_700_000_003.0},
+                orjson.dumps(
+                    {"op": "quest", "name": "Find the artifact", "status": "completed"}
+                ).decode(),
+            ),
+        ]
+        collections = _stub_store(
+            fake_chroma_client, [({"delta_seq": 10}, snapshot)], deltas
+        )
+
+        state = world_state_manager.load_world_state()
+
+        collections["world_state_deltas"].get.assert_called_once_with(
+            where={"$and": [{"state_id": STATE_ID}, {"seq": {"$gt": 10}}]}
+        )
+        assert state.current_location == "Wyrm's Rock"
+        assert state.active_quests == []
+        assert state.completed_quests == ["Find the artifact"]
+        assert world_state_manager._delta_seq == 13
+
+        # New deltas continue after the replayed ones
+        world_state_manager.set_story_flag("entered_the_city")
+        world_state_manager.flush()
+        assert _saved_delta_seqs(fake_chroma_client)[0] > 13
+
+    def test_load_failure_does_not_overwrite_saved_state(
+        self, world_state_manager, fake_chroma_client
+    ):
+        """An unreadable snapshot is replaced in memory only, never in storage."""
+        unreadable = orjson.dumps(["v0", "Act III"]).decode()
+        _stub_store(fake_chroma_client, [({"delta_seq": 10}, unreadable)], [])
+
+        state = world_state_manager.load_world_state()
+        world_state_manager.update_location("Vallaki")
+        world_state_manager.save_world_state()
+        world_state_manager.flush()
+
+        assert state.current_location == "Vallaki"
+        fake_chroma_client.upsert_documents.assert_not_called()
+        fake_chroma_client.add_documents.assert_not_called()
+        fake_chroma_client.delete_from_collection.assert_not_called()
+
+    def test_event_timestamp_matches_change_time(
+        self, world_state_manager, fake_chroma_client
+    ):
+        """An event's stamp, last_updated and stored delta share one clock read."""
+        world_state_manager.current_state = WorldState()
+        # A second clock read would land two minutes later
+        clock = iter((EVENT_TIME, EVENT_TIME + 120))
+
+        with patch("time.time", lambda: next(clock)):
+            world_state_manager.add_important_event("Ireena joined the party")
+        world_state_manager.flush()
+
+        state = world_state_manager.current_state
+        stamp = datetime.fromtimestamp(EVENT_TIME).strftime("%Y-%m-%d %H:%M")
+        assert state.important_events[-1] == f"[{stamp}] Ireena joined the party"
+        assert state.last_updated == datetime.fromtimestamp(EVENT_TIME)
+        (call,) = fake_chroma_client.add_documents.call_args_list
+        assert call.kwargs["metadatas"][0]["ts"] == EVENT_TIME
+
+    def test_compaction_at_threshold(self, world_state_manager, fake_chroma_client):
+        """A snapshot is written once DELTA_COMPACT_THRESHOLD deltas pile up."""
+        world_state_manager.current_state = WorldState()
+
+        for i in range(DELTA_COMPACT_THRESHOLD - 1):
+            world_state_manager.set_story_flag(f"flag_{i}")
+        world_state_manager.flush()
+        assert _saved_snapshots(fake_chroma_client) == []
+
+        world_state_manager.set_story_flag("one_too_many")
+        world_state_manager.flush()
+
+        snapshots = _saved_snapshots(fake_chroma_client)
+        assert len(snapshots) == 1
+        assert snapshots[0]["delta_seq"] == world_state_manager._delta_seq
+        fake_chroma_client.delete_from_collection.assert_called_once_with(
+            "world_state_deltas",
+            where={
+                "$and": [
+                    {"state_id": STATE_ID},
+                    {"seq": {"$lte": world_state_manager._delta_seq}},
+                ]
+            },
+        )
+
+    def test_failed_snapshot_keeps_deltas(
+        self, world_state_manager, fake_chroma_client
+    ):
+        """Deltas are only compacted once their snapshot has been stored."""
+        failed = Future()
+        failed.set_exception(RuntimeError("database is locked"))
+        fake_chroma_client.upsert_documents.return_value = failed
+        world_state_manager.current_state = WorldState()
+
+        world_state_manager.set_story_flag("met_the_burgomaster")
+        world_state_manager.save_world_state()
+        world_state_manager.flush()
+
+        fake_chroma_client.upsert_documents.assert_called_once()
+        fake_chroma_client.delete_from_collection.assert_not_called()
+        assert len(_saved_delta_seqs(fake_chroma_client)) == 1
+
+    def test_delta_seqs_unique_across_managers(self, fake_chroma_client):
+        """Managers sharing a store never write the same sequence number."""
+        embedding_manager = MagicMock(spec=EmbeddingManager)
+        managers = [
+            WorldStateManager(fake_chroma_client, embedding_manager) for _ in range(2)
+        ]
+        try:
+            for manager in managers:
+                manager.current_state = WorldState()
+            for i in range(5):
+                for manager in managers:
+                    manager.set_story_flag(f"flag_{i}")
+            for manager in managers:
+                manager.flush()
+        finally:
+            for manager in managers:
+                manager.close()
+
+        seqs = _saved_delta_seqs(fake_chroma_client)
+        assert len(seqs) == 10
+        assert len(set(seqs)) == len(seqs)